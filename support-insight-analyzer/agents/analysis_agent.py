@@ -1,181 +1,312 @@
-import pandas as pd
-from textblob import TextBlob
-from collections import Counter
-import logging
-from datetime import datetime, timedelta
-
-class AnalysisAgent:
-    def __init__(self):
-        self.logger = logging.getLogger('analysis_agent')
-    
-    def analyze_sentiment(self, tickets):
-        """Analyze sentiment from ticket descriptions"""
-        sentiments = []
-        sentiment_scores = []
-        
-        for ticket in tickets:
-            # Simple sentiment analysis using TextBlob
-            description = f"{ticket['subject']} {ticket['description']}"
-            blob = TextBlob(description)
-            sentiment_score = blob.sentiment.polarity
-            
-            if sentiment_score > 0.1:
-                sentiment = "Positive"
-            elif sentiment_score < -0.1:
-                sentiment = "Negative"
-            else:
-                sentiment = "Neutral"
-            
-            sentiments.append(sentiment)
-            sentiment_scores.append(sentiment_score)
-        
-        sentiment_distribution = Counter(sentiments)
-        avg_sentiment_score = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0
-        
-        return {
-            "distribution": dict(sentiment_distribution),
-            "average_score": round(avg_sentiment_score, 3),
-            "total_positive": sentiment_distribution.get("Positive", 0),
-            "total_negative": sentiment_distribution.get("Negative", 0),
-            "total_neutral": sentiment_distribution.get("Neutral", 0)
-        }
-    
-    def detect_trends(self, tickets):
-        """Detect emerging trends and patterns"""
-        df = pd.DataFrame(tickets)
-        
-        # Trend analysis by category
-        category_trends = df['category'].value_counts().to_dict()
-        
-        # Priority trends
-        priority_trends = df['priority'].value_counts().to_dict()
-        
-        # Daily ticket volume
-        daily_volume = df['created_date'].value_counts().sort_index().to_dict()
-        
-        # Emerging issues (categories with increasing frequency)
-        emerging_categories = []
-        for category, count in category_trends.items():
-            if count >= 3:  # Threshold for emerging trend
-                emerging_categories.append({
-                    "category": category,
-                    "frequency": count,
-                    "trend": "Increasing" if count > 5 else "Stable"
-                })
-        
-        return {
-            "category_trends": category_trends,
-            "priority_trends": priority_trends,
-            "daily_volume": daily_volume,
-            "emerging_issues": sorted(emerging_categories, key=lambda x: x['frequency'], reverse=True),
-            "most_common_category": max(category_trends.items(), key=lambda x: x[1])[0] if category_trends else "N/A"
-        }
-    
-    def analyze_priorities(self, tickets):
-        """Analyze ticket priorities and urgency"""
-        df = pd.DataFrame(tickets)
-        
-        priority_stats = {
-            "Critical": len(df[df['priority'] == 'Critical']),
-            "High": len(df[df['priority'] == 'High']),
-            "Medium": len(df[df['priority'] == 'Medium']),
-            "Low": len(df[df['priority'] == 'Low'])
-        }
-        
-        # Priority by category
-        priority_by_category = {}
-        for category in df['category'].unique():
-            category_data = df[df['category'] == category]
-            priority_by_category[category] = category_data['priority'].value_counts().to_dict()
-        
-        urgency_score = (
-            priority_stats['Critical'] * 4 + 
-            priority_stats['High'] * 3 + 
-            priority_stats['Medium'] * 2 + 
-            priority_stats['Low'] * 1
-        ) / len(tickets) if tickets else 0
-        
-        return {
-            "priority_distribution": priority_stats,
-            "priority_by_category": priority_by_category,
-            "urgency_score": round(urgency_score, 2),
-            "requires_immediate_attention": priority_stats['Critical'] + priority_stats['High']
-        }
-    
-    def generate_insights(self, sentiment_analysis, trend_analysis, priority_analysis):
-        """Generate actionable insights from analysis results"""
-        insights = []
-        
-        # Sentiment insights
-        if sentiment_analysis['total_negative'] > sentiment_analysis['total_positive']:
-            insights.append({
-                "type": "warning",
-                "title": "High Negative Sentiment",
-                "description": f"Negative sentiment ({sentiment_analysis['total_negative']} tickets) exceeds positive sentiment. Consider proactive outreach.",
-                "priority": "High"
-            })
-        
-        # Priority insights
-        if priority_analysis['requires_immediate_attention'] > 5:
-            insights.append({
-                "type": "critical",
-                "title": "High Priority Backlog",
-                "description": f"{priority_analysis['requires_immediate_attention']} tickets require immediate attention.",
-                "priority": "Critical"
-            })
-        
-        # Trend insights
-        emerging_issues = trend_analysis['emerging_issues']
-        if emerging_issues and emerging_issues[0]['frequency'] > 8:
-            insights.append({
-                "type": "info",
-                "title": "Emerging Issue Detected",
-                "description": f"'{emerging_issues[0]['category']}' shows increasing frequency ({emerging_issues[0]['frequency']} cases).",
-                "priority": "Medium"
-            })
-        
-        # Performance insights
-        total_tickets = sum(trend_analysis['category_trends'].values())
-        if total_tickets > 50:
-            insights.append({
-                "type": "success",
-                "title": "High Ticket Volume",
-                "description": f"Analyzed {total_tickets} tickets in the period. Consider scaling support resources.",
-                "priority": "Medium"
-            })
-        
-        return sorted(insights, key=lambda x: {'Critical': 0, 'High': 1, 'Medium': 2, 'Low': 3}[x['priority']])
-    
-    def generate_recommendations(self, insights):
-        """Generate recommendations based on insights"""
-        recommendations = []
-        
-        for insight in insights:
-            if insight['type'] == 'critical':
-                recommendations.append({
-                    "action": "Immediate Review Required",
-                    "description": f"Address {insight['title']} as top priority",
-                    "timeline": "Within 24 hours"
-                })
-            elif insight['type'] == 'warning':
-                recommendations.append({
-                    "action": "Sentiment Improvement",
-                    "description": "Implement customer satisfaction measures",
-                    "timeline": "Within 1 week"
-                })
-        
-        # Add general recommendations
-        recommendations.extend([
-            {
-                "action": "Weekly Trend Review",
-                "description": "Schedule regular analysis of emerging trends",
-                "timeline": "Ongoing"
-            },
-            {
-                "action": "Agent Training",
-                "description": "Focus training on most common issue categories",
-                "timeline": "Next month"
-            }
-        ])
-        
+from collections import Counter
+import logging
+import threading
+from datetime import datetime, timedelta
+from app_config import Config
+from memory.sentiment_cache import SentimentCache
+from streaming.emerging_issues import EmergingIssueDetector
+from . import sentiment_engines
+from .sentiment_engines import create_engine
+
+PRIORITY_LEVELS = ["Critical", "High", "Medium", "Low"]
+
+# TextBlob pulls in scikit-learn through nltk; two threads importing it at once can see a half-initialised sklearn
+_preload_lock = threading.Lock()
+_preloaded = False
+
+def preload_dependencies():
+    """Import pandas, the sentiment engines' libraries and the topic model's once, before any thread uses them"""
+    global _preloaded
+    with _preload_lock:
+        if _preloaded:
+            return
+        import pandas
+        import scipy.sparse
+        import sklearn.decomposition
+        import sklearn.utils
+        sentiment_engines.preload()
+        _preloaded = True
+
+def create_topic_model():
+    """StreamingTopicModel configured from Config"""
+    from streaming.topic_model import StreamingTopicModel
+    return StreamingTopicModel(
+        n_topics=Config.TOPIC_COUNT,
+        n_features=Config.TOPIC_HASH_FEATURES,
+        batch_size=Config.TOPIC_BATCH_SIZE,
+        forget_factor=Config.TOPIC_FORGET_FACTOR,
+        preload=preload_dependencies
+    )
+
+def _ticket_text(ticket):
+    return f"{ticket['subject']} {ticket['description']}"
+
+def _label(score):
+    if score > 0.1:
+        return "Positive"
+    elif score < -0.1:
+        return "Negative"
+    return "Neutral"
+
+class TicketAggregates:
+    """Counts shared by trend and priority analysis, computed in one groupby"""
+
+    def __init__(self, tickets):
+        import pandas as pd
+
+        frame = pd.DataFrame({
+            'category': pd.Categorical([t['category'] for t in tickets]),
+            'priority': pd.Categorical([t['priority'] for t in tickets]),
+            # Imported and batch tickets carry a time of day; counts are kept per calendar day
+            'created_date': pd.Categorical([str(t['created_date'])[:10] for t in tickets])
+        })
+        self.total = len(frame)
+
+        # Single pass over the tickets; every other count is derived from this small table
+        counts = frame.groupby(['category', 'priority', 'created_date'], observed=True).size()
+        counts = counts[counts > 0]
+
+        self.counts = counts  # (category, priority, created_date) -> tickets
+        self.crosstab = counts.groupby(level=['category', 'priority'], observed=True).sum()
+        self.category_counts = self._to_dict(
+            counts.groupby(level='category', observed=True).sum().sort_values(ascending=False, kind='stable')
+        )
+        self.priority_counts = self._to_dict(
+            counts.groupby(level='priority', observed=True).sum().sort_values(ascending=False, kind='stable')
+        )
+        self.daily_volume = self._to_dict(
+            counts.groupby(level='created_date', observed=True).sum().sort_index()
+        )
+
+    @staticmethod
+    def _to_dict(series):
+        return {key: int(value) for key, value in series.items()}
+
+    def priority_by_category(self):
+        result = {}
+        for (category, priority), count in self.crosstab.items():
+            result.setdefault(category, {})[priority] = int(count)
+        return {
+            category: dict(sorted(counts.items(), key=lambda x: x[1], reverse=True))
+            for category, counts in result.items()
+        }
+
+class AnalysisAgent:
+    def __init__(self, sentiment_cache=None, sentiment_engine=None, topic_model=None):
+        self.logger = logging.getLogger('analysis_agent')
+        self._aggregate_cache = (None, 0, None)
+        self._aggregate_lock = threading.Lock()
+        self.sentiment_cache = sentiment_cache or SentimentCache()
+        self.sentiment_engine = create_engine(sentiment_engine or Config.SENTIMENT_ENGINE)
+        self.topic_model = topic_model  # StreamingTopicModel, built on first use when not shared
+        self._topic_lock = threading.Lock()
+    
+    def aggregate(self, tickets):
+        """Build (or reuse) the shared aggregation stage for a ticket list"""
+        # Locked so concurrent pipeline stages share one computation
+        with self._aggregate_lock:
+            cached_tickets, cached_len, aggregates = self._aggregate_cache
+            if cached_tickets is tickets and cached_len == len(tickets):
+                return aggregates
+            
+            aggregates = TicketAggregates(tickets)
+            self._aggregate_cache = (tickets, len(tickets), aggregates)
+            return aggregates
+    
+    def analyze_sentiment(self, tickets):
+        """Analyze sentiment from ticket descriptions"""
+        keys = [SentimentCache.key_for(ticket, self.sentiment_engine.name) for ticket in tickets]
+        scores = self.sentiment_cache.get_many(keys)
+        hits = len(scores)
+        
+        # Score each distinct uncached text once
+        missing = {}
+        for key, ticket in zip(keys, tickets):
+            if key not in scores and key not in missing:
+                missing[key] = _ticket_text(ticket)
+        
+        if missing:
+            new_scores = dict(zip(missing.keys(), self.sentiment_engine.score(list(missing.values()))))
+            self.sentiment_cache.put_many(new_scores)
+            scores.update(new_scores)
+        
+        self.logger.info(f"Sentiment cache: {hits} hits, {len(missing)} misses")
+        
+        sentiment_scores = [scores[key] for key in keys]
+        sentiments = [_label(score) for score in sentiment_scores]
+        
+        sentiment_distribution = Counter(sentiments)
+        avg_sentiment_score = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0
+        
+        return {
+            "distribution": dict(sentiment_distribution),
+            "average_score": round(avg_sentiment_score, 3),
+            "total_positive": sentiment_distribution.get("Positive", 0),
+            "total_negative": sentiment_distribution.get("Negative", 0),
+            "total_neutral": sentiment_distribution.get("Neutral", 0),
+            "cache_stats": {"hits": hits, "misses": len(missing)}
+        }
+    
+    def detect_trends(self, tickets):
+        """Detect emerging trends and patterns"""
+        aggregates = self.aggregate(tickets)
+        
+        # Trend analysis by category
+        category_trends = aggregates.category_counts
+        
+        # Priority trends
+        priority_trends = aggregates.priority_counts
+        
+        # Daily ticket volume
+        daily_volume = aggregates.daily_volume
+        
+        # Emerging issues (segments surging above their own baseline)
+        emerging_issues = [
+            dict(issue, frequency=category_trends.get(issue['category'], 0), trend="Increasing")
+            for issue in self.detect_emerging_issues(aggregates)
+        ]
+        
+        return {
+            "category_trends": category_trends,
+            "priority_trends": priority_trends,
+            "daily_volume": daily_volume,
+            "emerging_issues": emerging_issues,
+            "most_common_category": max(category_trends.items(), key=lambda x: x[1])[0] if category_trends else "N/A"
+        }
+    
+    def detect_emerging_issues(self, aggregates):
+        """Replay daily segment counts in date order through a surge detector; segments emerging at the end"""
+        dated = []
+        for (category, priority, created), count in aggregates.counts.items():
+            try:
+                dated.append((datetime.fromisoformat(str(created)).timestamp(), category, priority, int(count)))
+            except ValueError:
+                continue
+        if not dated:
+            return []
+        dated.sort(key=lambda row: row[0])
+        
+        # The baseline is learnt from the window itself, so the warmup is a share of the dates it spans
+        detector = EmergingIssueDetector(
+            fast_half_life=Config.EMERGING_BATCH_FAST_HALF_LIFE,
+            baseline_half_life=Config.EMERGING_BATCH_BASELINE_HALF_LIFE,
+            shift=Config.EMERGING_RATE_SHIFT,
+            threshold=Config.EMERGING_CUSUM_THRESHOLD,
+            min_z=Config.EMERGING_MIN_Z,
+            warmup=(dated[-1][0] - dated[0][0]) * Config.EMERGING_BATCH_WARMUP_FRACTION
+        )
+        for when, category, priority, count in dated:
+            detector.observe(category, priority, count, now=when)
+        return detector.emerging(now=dated[-1][0])
+    
+    def extract_topics(self, tickets):
+        """Topics within the ticket text, with their ticket counts and leading terms for this window"""
+        with self._topic_lock:
+            if self.topic_model is None:
+                self.topic_model = create_topic_model()
+        return self.topic_model.summarize(tickets, top_terms=Config.TOPIC_TOP_TERMS)
+    
+    def analyze_priorities(self, tickets):
+        """Analyze ticket priorities and urgency"""
+        aggregates = self.aggregate(tickets)
+        
+        priority_stats = {
+            level: aggregates.priority_counts.get(level, 0) for level in PRIORITY_LEVELS
+        }
+        
+        # Priority by category
+        priority_by_category = aggregates.priority_by_category()
+        
+        urgency_score = (
+            priority_stats['Critical'] * 4 + 
+            priority_stats['High'] * 3 + 
+            priority_stats['Medium'] * 2 + 
+            priority_stats['Low'] * 1
+        ) / len(tickets) if tickets else 0
+        
+        return {
+            "priority_distribution": priority_stats,
+            "priority_by_category": priority_by_category,
+            "urgency_score": round(urgency_score, 2),
+            "requires_immediate_attention": priority_stats['Critical'] + priority_stats['High']
+        }
+    
+    def generate_insights(self, sentiment_analysis, trend_analysis, priority_analysis):
+        """Generate actionable insights from analysis results"""
+        insights = []
+        
+        # Sentiment insights
+        if sentiment_analysis['total_negative'] > sentiment_analysis['total_positive']:
+            insights.append({
+                "type": "warning",
+                "title": "High Negative Sentiment",
+                "description": f"Negative sentiment ({sentiment_analysis['total_negative']} tickets) exceeds positive sentiment. Consider proactive outreach.",
+                "priority": "High"
+            })
+        
+        # Priority insights
+        if priority_analysis['requires_immediate_attention'] > 5:
+            insights.append({
+                "type": "critical",
+                "title": "High Priority Backlog",
+                "description": f"{priority_analysis['requires_immediate_attention']} tickets require immediate attention.",
+                "priority": "Critical"
+            })
+        
+        # Trend insights
+        emerging_issues = trend_analysis['emerging_issues']
+        if emerging_issues:
+            issue = emerging_issues[0]
+            insights.append({
+                "type": "info",
+                "title": "Emerging Issue Detected",
+                "description": f"'{issue['segment']}' is running at {issue['rate_per_hour'] * 24:.1f} tickets/day "
+                               f"against a baseline of {issue['baseline_per_hour'] * 24:.1f} (z={issue['z_score']}) since {issue['onset'][:10]}.",
+                "priority": "Medium"
+            })
+        
+        # Performance insights
+        total_tickets = sum(trend_analysis['category_trends'].values())
+        if total_tickets > 50:
+            insights.append({
+                "type": "success",
+                "title": "High Ticket Volume",
+                "description": f"Analyzed {total_tickets} tickets in the period. Consider scaling support resources.",
+                "priority": "Medium"
+            })
+        
+        return sorted(insights, key=lambda x: {'Critical': 0, 'High': 1, 'Medium': 2, 'Low': 3}[x['priority']])
+    
+    def generate_recommendations(self, insights):
+        """Generate recommendations based on insights"""
+        recommendations = []
+        
+        for insight in insights:
+            if insight['type'] == 'critical':
+                recommendations.append({
+                    "action": "Immediate Review Required",
+                    "description": f"Address {insight['title']} as top priority",
+                    "timeline": "Within 24 hours"
+                })
+            elif insight['type'] == 'warning':
+                recommendations.append({
+                    "action": "Sentiment Improvement",
+                    "description": "Implement customer satisfaction measures",
+                    "timeline": "Within 1 week"
+                })
+        
+        # Add general recommendations
+        recommendations.extend([
+            {
+                "action": "Weekly Trend Review",
+                "description": "Schedule regular analysis of emerging trends",
+                "timeline": "Ongoing"
+            },
+            {
+                "action": "Agent Training",
+                "description": "Focus training on most common issue categories",
+                "timeline": "Next month"
+            }
+        ])
+        
         return recommendations
\ No newline at end of file
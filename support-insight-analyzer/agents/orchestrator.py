@@ -1,79 +1,113 @@
-import logging
-from datetime import datetime
-from .analysis_agent import AnalysisAgent
-
-class Orchestrator:
-    def __init__(self, memory_manager):
-        self.memory_manager = memory_manager
-        self.analysis_agent = AnalysisAgent()
-        self.logger = logging.getLogger('orchestrator')
-        self.system_status = "Ready"
-    
-    def run_complete_analysis(self):
-        """Run complete multi-agent pipeline analysis"""
-        self.logger.info("🚀 Starting multi-agent analysis pipeline...")
-        
-        try:
-            # Step 1: Data Collection
-            self.logger.info("📊 Step 1: Collecting recent tickets...")
-            recent_tickets = self.memory_manager.get_recent_tickets(days=7)
-            
-            if not recent_tickets:
-                return {"error": "No recent tickets found for analysis"}
-            
-            # Step 2: Sentiment Analysis
-            self.logger.info("😊 Step 2: Analyzing customer sentiment...")
-            sentiment_analysis = self.analysis_agent.analyze_sentiment(recent_tickets)
-            
-            # Step 3: Trend Detection
-            self.logger.info("📈 Step 3: Detecting emerging trends...")
-            trend_analysis = self.analysis_agent.detect_trends(recent_tickets)
-            
-            # Step 4: Priority Analysis
-            self.logger.info("🎯 Step 4: Analyzing ticket priorities...")
-            priority_analysis = self.analysis_agent.analyze_priorities(recent_tickets)
-            
-            # Step 5: Generate Insights
-            self.logger.info("💡 Step 5: Generating insights...")
-            insights = self.analysis_agent.generate_insights(
-                sentiment_analysis, 
-                trend_analysis, 
-                priority_analysis
-            )
-            
-            # Compile final results
-            analysis_results = {
-                "timestamp": datetime.now().isoformat(),
-                "tickets_analyzed": len(recent_tickets),
-                "time_period": "7 days",
-                "sentiment_analysis": sentiment_analysis,
-                "trend_analysis": trend_analysis,
-                "priority_analysis": priority_analysis,
-                "key_insights": insights,
-                "recommendations": self.analysis_agent.generate_recommendations(insights)
-            }
-            
-            # Save analysis
-            analysis_id = self.memory_manager.save_analysis(analysis_results)
-            analysis_results['analysis_id'] = analysis_id
-            
-            self.logger.info("✅ Multi-agent analysis completed successfully!")
-            return analysis_results
-            
-        except Exception as e:
-            self.logger.error(f"❌ Analysis failed: {str(e)}")
-            return {"error": f"Analysis failed: {str(e)}"}
-    
-    def get_system_status(self):
-        """Get current system status"""
-        stats = self.memory_manager.get_ticket_statistics()
-        
-        return {
-            "system_status": self.system_status,
-            "environment": "configured successfully",
-            "genini_agent": "Ready",
-            "local_memory": "Ready",
-            "multi_agent_system": "Ready",
-            "statistics": stats,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+import logging
+from datetime import datetime
+from app_config import Config
+from monitoring.metrics import ANALYSES_RUN, PIPELINE_STAGE_SECONDS
+from .analysis_agent import AnalysisAgent, preload_dependencies
+from .pipeline import Stage, StagePipeline
+
+class Orchestrator:
+    def __init__(self, memory_manager, profiler=None, topic_model=None):
+        self.memory_manager = memory_manager
+        self.profiler = profiler
+        self.analysis_agent = AnalysisAgent(topic_model=topic_model)
+        self.logger = logging.getLogger('orchestrator')
+        self.system_status = "Ready"
+    
+    def run_complete_analysis(self, profile=False):
+        """Run complete multi-agent pipeline analysis, profiled if asked or sampled"""
+        if self.profiler is None:
+            return self._run_pipeline()
+        return self.profiler.run(self._run_pipeline, requested=profile, kind='pipeline')
+    
+    def _run_pipeline(self):
+        self.logger.info("🚀 Starting multi-agent analysis pipeline...")
+        
+        try:
+            # Step 1: Data Collection
+            self.logger.info("📊 Step 1: Collecting recent tickets...")
+            with PIPELINE_STAGE_SECONDS.time(stage='collect', status='ok'):
+                recent_tickets = self.memory_manager.get_recent_tickets(days=7)
+            
+            if not recent_tickets:
+                ANALYSES_RUN.inc(kind='pipeline', status='no_data')
+                return {"error": "No recent tickets found for analysis"}
+            
+            # Stages import TextBlob and scikit-learn on their own threads; load them here first so they can't collide
+            try:
+                preload_dependencies()
+            except ImportError as e:
+                self.logger.warning(f"Analysis dependencies not preloaded: {e}")
+            
+            # Steps 2-6: independent analyses run concurrently, insights wait for sentiment, trends and priorities
+            self.logger.info("🧩 Steps 2-6: Running sentiment, trend, priority, topic and insight stages...")
+            pipeline = StagePipeline(
+                self._build_stages(recent_tickets),
+                max_workers=Config.MAX_AGENTS,
+                total_timeout=Config.ANALYSIS_TIMEOUT
+            )
+            results, stage_status = pipeline.run()
+            insights = results.get('insights', [])
+            for name, state in stage_status.items():
+                if state['status'] != 'skipped':
+                    PIPELINE_STAGE_SECONDS.observe(state['duration'], stage=name, status=state['status'])
+            
+            # Compile final results
+            analysis_results = {
+                "timestamp": datetime.now().isoformat(),
+                "tickets_analyzed": len(recent_tickets),
+                "time_period": "7 days",
+                "sentiment_analysis": results.get('sentiment'),
+                "trend_analysis": results.get('trends'),
+                "priority_analysis": results.get('priorities'),
+                "topic_analysis": results.get('topics'),
+                "key_insights": insights,
+                "recommendations": self.analysis_agent.generate_recommendations(insights),
+                "stage_status": stage_status,
+                "status": "completed" if all(
+                    s['status'] == 'ok' for s in stage_status.values()
+                ) else "partial"
+            }
+            
+            # Save analysis
+            with PIPELINE_STAGE_SECONDS.time(stage='save', status='ok'):
+                analysis_id = self.memory_manager.save_analysis(analysis_results)
+            analysis_results['analysis_id'] = analysis_id
+            ANALYSES_RUN.inc(kind='pipeline', status=analysis_results['status'])
+            
+            if analysis_results['status'] == 'completed':
+                self.logger.info("✅ Multi-agent analysis completed successfully!")
+            else:
+                failed = [name for name, s in stage_status.items() if s['status'] != 'ok']
+                self.logger.warning(f"⚠️ Analysis completed with incomplete stages: {', '.join(failed)}")
+            return analysis_results
+            
+        except Exception as e:
+            self.logger.error(f"❌ Analysis failed: {str(e)}")
+            ANALYSES_RUN.inc(kind='pipeline', status='error')
+            return {"error": f"Analysis failed: {str(e)}"}
+    
+    def _build_stages(self, tickets):
+        """Pipeline stage graph; timeout shares are fractions of Config.ANALYSIS_TIMEOUT"""
+        agent = self.analysis_agent
+        return [
+            Stage('sentiment', lambda: agent.analyze_sentiment(tickets), timeout_share=0.8),
+            Stage('trends', lambda: agent.detect_trends(tickets), timeout_share=0.4),
+            Stage('priorities', lambda: agent.analyze_priorities(tickets), timeout_share=0.4),
+            Stage('topics', lambda: agent.extract_topics(tickets), timeout_share=0.6),
+            Stage('insights', agent.generate_insights,
+                  depends_on=('sentiment', 'trends', 'priorities'), timeout_share=0.2)
+        ]
+    
+    def get_system_status(self):
+        """Get current system status"""
+        stats = self.memory_manager.get_ticket_statistics()
+        
+        return {
+            "system_status": self.system_status,
+            "environment": "configured successfully",
+            "genini_agent": "Ready",
+            "local_memory": "Ready",
+            "multi_agent_system": "Ready",
+            "statistics": stats,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
\ No newline at end of file
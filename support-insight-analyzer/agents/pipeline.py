@@ -0,0 +1,124 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class Stage:
+    """A pipeline step; `func` receives the results of `depends_on` positionally"""
+
+    def __init__(self, name, func, depends_on=(), timeout_share=1.0):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout_share = timeout_share
+
+
+class StagePipeline:
+    """Run stages as a dependency graph, independent stages concurrently"""
+
+    START_POLL_INTERVAL = 0.05  # seconds between checks for queued stages that have started
+
+    def __init__(self, stages, max_workers, total_timeout):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        self.total_timeout = total_timeout
+        self.logger = logging.getLogger('pipeline')
+
+        for stage in stages:
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    def run(self):
+        """Execute all stages; returns (results, status) keyed by stage name"""
+        results = {}
+        status = {}
+        pending = dict(self.stages)
+        running = {}  # future -> stage
+        started = {}  # stage name -> when its function began running on a worker
+        run_deadline = time.monotonic() + self.total_timeout
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='stage')
+        try:
+            while pending or running:
+                self._schedule(pending, running, results, status, executor, started)
+                if not running:
+                    break
+
+                now = time.monotonic()
+                next_deadline = min(self._deadline(stage, started, run_deadline) for stage in running.values())
+                timeout = max(0, next_deadline - now)
+                if any(stage.name not in started for stage in running.values()):
+                    # A queued stage's budget begins when a worker picks it up; check back for that
+                    timeout = min(timeout, self.START_POLL_INTERVAL)
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    stage = running.pop(future)
+                    duration = round(time.monotonic() - started.get(stage.name, now), 3)
+                    try:
+                        results[stage.name] = future.result()
+                        status[stage.name] = {'status': 'ok', 'duration': duration}
+                    except Exception as e:
+                        self.logger.error(f"Stage '{stage.name}' failed: {e}")
+                        status[stage.name] = {'status': 'failed', 'duration': duration, 'error': str(e)}
+
+                now = time.monotonic()
+                for future, stage in list(running.items()):
+                    deadline = self._deadline(stage, started, run_deadline)
+                    if now >= deadline:
+                        running.pop(future)
+                        future.cancel()
+                        self.logger.error(f"Stage '{stage.name}' timed out")
+                        if stage.name in started:
+                            status[stage.name] = {
+                                'status': 'timeout',
+                                'duration': round(now - started[stage.name], 3),
+                                'error': f"Exceeded {round(deadline - started[stage.name], 1)}s budget"
+                            }
+                        else:
+                            status[stage.name] = {
+                                'status': 'timeout',
+                                'duration': 0,
+                                'error': "Analysis time ran out before a worker was free to start the stage"
+                            }
+
+            for name in pending:
+                status[name] = {'status': 'skipped', 'duration': 0, 'error': 'Unresolvable dependencies'}
+        finally:
+            # Timed-out threads cannot be interrupted; let them finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results, status
+
+    def _deadline(self, stage, started, run_deadline):
+        """A stage's own budget counts from when it starts running; the run deadline bounds everything"""
+        if stage.name not in started:
+            return run_deadline
+        return min(started[stage.name] + stage.timeout_share * self.total_timeout, run_deadline)
+
+    @staticmethod
+    def _timed(stage, args, started):
+        def call():
+            started[stage.name] = time.monotonic()
+            return stage.func(*args)
+        return call
+
+    def _schedule(self, pending, running, results, status, executor, started):
+        for name, stage in list(pending.items()):
+            dep_states = [status.get(dep, {}).get('status') for dep in stage.depends_on]
+            if any(state not in (None, 'ok') for state in dep_states):
+                pending.pop(name)
+                failed = [dep for dep, state in zip(stage.depends_on, dep_states) if state not in (None, 'ok')]
+                status[name] = {'status': 'skipped', 'duration': 0,
+                                'error': f"Upstream stage(s) did not complete: {', '.join(failed)}"}
+            elif all(state == 'ok' for state in dep_states):
+                pending.pop(name)
+                args = [results[dep] for dep in stage.depends_on]
+                running[executor.submit(self._timed(stage, args, started))] = stage
+
+        # A skipped stage cascades to its own dependents
+        if any(
+            any(status.get(dep, {}).get('status') not in (None, 'ok') for dep in stage.depends_on)
+            for stage in pending.values()
+        ):
+            self._schedule(pending, running, results, status, executor, started)
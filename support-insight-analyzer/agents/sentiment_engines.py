@@ -0,0 +1,106 @@
+import os
+import logging
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# numpy, scikit-learn and TextBlob are imported on first use; see preload()
+
+# Batches smaller than this are scored in-process; pool start-up would dominate
+POOL_MIN_BATCH = 2000
+POOL_CHUNK_SIZE = 500
+
+# Used when TextBlob's bundled lexicon cannot be located
+FALLBACK_LEXICON = {
+    "good": 0.7, "great": 0.8, "excellent": 1.0, "happy": 0.8, "thanks": 0.2,
+    "resolved": 0.3, "fast": 0.2, "helpful": 0.5, "working": 0.1, "correct": 0.0,
+    "bad": -0.7, "poor": -0.4, "failed": -0.5, "failing": -0.5, "slow": -0.3,
+    "unable": -0.5, "crash": -0.6, "crashes": -0.6, "crashing": -0.6, "error": -0.4,
+    "concerned": -0.2, "stuck": -0.3, "unresponsive": -0.4, "discrepancy": -0.2,
+    "timeout": -0.3, "broken": -0.4, "problem": -0.2, "issues": -0.1
+}
+
+def preload():
+    """Import the engines' heavy dependencies now rather than on the first analysis"""
+    import numpy
+    import sklearn.feature_extraction.text
+    import textblob
+
+def _textblob_scores(texts):
+    """Score a chunk of texts with TextBlob (runs in pool workers)"""
+    from textblob import TextBlob
+    return [TextBlob(text).sentiment.polarity for text in texts]
+
+def load_textblob_lexicon():
+    """Average polarity per word form from TextBlob's bundled en-sentiment.xml"""
+    import textblob
+    path = os.path.join(os.path.dirname(textblob.__file__), 'en', 'en-sentiment.xml')
+    if not os.path.exists(path):
+        return dict(FALLBACK_LEXICON)
+
+    polarities = defaultdict(list)
+    for word in ET.parse(path).getroot().iter('word'):
+        form = word.get('form', '').lower()
+        if form and ' ' not in form:
+            polarities[form].append(float(word.get('polarity', 0)))
+    return {form: sum(values) / len(values) for form, values in polarities.items()}
+
+
+class TextBlobEngine:
+    """Reference engine: TextBlob's pattern analyzer, one text at a time"""
+
+    name = 'textblob'
+
+    def score(self, texts):
+        if len(texts) < POOL_MIN_BATCH:
+            return _textblob_scores(texts)
+
+        chunks = [texts[i:i + POOL_CHUNK_SIZE] for i in range(0, len(texts), POOL_CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            results = pool.map(_textblob_scores, chunks)
+        return [score for chunk in results for score in chunk]
+
+
+class LexiconEngine:
+    """Fast engine: whole-batch tokenization and one sparse dot product against a polarity lexicon"""
+
+    name = 'lexicon'
+
+    def __init__(self, lexicon=None):
+        import numpy as np
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.logger = logging.getLogger('sentiment_engines')
+        lexicon = lexicon or load_textblob_lexicon()
+        words = sorted(lexicon)
+        self.vectorizer = CountVectorizer(
+            vocabulary=words,
+            lowercase=True,
+            token_pattern=r"(?u)\b\w[\w']*\b"
+        )
+        self.polarity = np.array([lexicon[w] for w in words], dtype=np.float64)
+        self.logger.info(f"Loaded sentiment lexicon with {len(words)} entries")
+
+    def score(self, texts):
+        import numpy as np
+
+        if not texts:
+            return []
+        # documents x lexicon-words count matrix, kept sparse throughout
+        counts = self.vectorizer.transform(texts)
+        totals = counts @ self.polarity
+        matched = np.asarray(counts.sum(axis=1)).ravel()
+        scores = np.divide(totals, matched, out=np.zeros_like(totals), where=matched > 0)
+        return np.clip(scores, -1.0, 1.0).tolist()
+
+
+ENGINES = {
+    'textblob': TextBlobEngine,
+    'lexicon': LexiconEngine,
+}
+
+def create_engine(name):
+    """Instantiate the sentiment engine registered under `name`"""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown sentiment engine: {name}")
+    return ENGINES[name]()
@@ -1,27 +1,100 @@
-import os
-from datetime import datetime
-
-class Config:
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-123'
-    DEBUG = True
-    
-    # System Configuration
-    SYSTEM_NAME = "SUPPORT INSIGHT ANALYZER - ENTERPRISE AI AGENT"
-    SYSTEM_VERSION = "2.0.0"
-    
-    # Paths
-    UPLOAD_FOLDER = 'uploads'
-    ANALYSIS_FOLDER = 'analysis_results'
-    
-    # Agent Settings
-    MAX_AGENTS = 5
-    ANALYSIS_TIMEOUT = 300  # 5 minutes
-    
-    def __init__(self):
-        self.initialize_directories()
-    
-    def initialize_directories(self):
-        os.makedirs(self.UPLOAD_FOLDER, exist_ok=True)
-        os.makedirs(self.ANALYSIS_FOLDER, exist_ok=True)
-
-config = Config()
\ No newline at end of file
+import os
+from datetime import datetime
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-123'
+    DEBUG = True
+    
+    # System Configuration
+    SYSTEM_NAME = "SUPPORT INSIGHT ANALYZER - ENTERPRISE AI AGENT"
+    SYSTEM_VERSION = "2.0.0"
+    
+    # Paths
+    UPLOAD_FOLDER = 'uploads'
+    ANALYSIS_FOLDER = 'analysis_results'
+    
+    # Agent Settings
+    MAX_AGENTS = 5
+    ANALYSIS_TIMEOUT = 300  # 5 minutes
+    SENTIMENT_ENGINE = os.environ.get('SENTIMENT_ENGINE', 'textblob')  # 'textblob' or 'lexicon'
+    
+    # Background analysis jobs
+    JOB_RESULT_TTL = 600  # seconds a finished job's result is kept
+    JOB_MAX_PENDING = 100
+    
+    # Live event stream
+    STREAM_HEARTBEAT_INTERVAL = 15  # seconds between keep-alive comments
+    TREND_HISTORY_INTERVAL = 60  # seconds between recorded trend history entries
+    LIVE_BUFFER_SIZE = 100  # tickets kept in the live ring buffer
+    LIVE_TREND_WINDOW = 20  # newest tickets covered by the live trend aggregates
+    
+    # Historical rollups
+    ROLLUP_DB_PATH = 'memory/rollups.db'
+    ROLLUP_MAX_POINTS = 500  # coarsest tier is chosen so a range query stays under this
+    BUCKET_FLUSH_INTERVAL = 30  # seconds; idle time buckets are closed at least this often
+    
+    # Bulk ticket ingestion
+    INGEST_BATCH_SIZE = 5000  # tickets per transactional batch
+    INGEST_MAX_QUEUED_BATCHES = 8  # beyond this the endpoint answers 429
+    INGEST_RETRY_AFTER = 2  # seconds
+    INGEST_MAX_REPORTED_ERRORS = 50
+    
+    # Historical analyses API
+    ANALYSES_PAGE_SIZE = 50
+    ANALYSES_MAX_PAGE_SIZE = 500
+    
+    # Profiling (stored under ANALYSIS_FOLDER/profiles)
+    PROFILE_ANALYSES = os.environ.get('PROFILE_ANALYSES', '').lower() in ('1', 'true', 'yes')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0.01'))  # share of runs profiled when enabled
+    PROFILE_MAX_STORED = 20  # oldest profiles are deleted beyond this
+    PROFILE_STACK_INTERVAL = 0.005  # seconds between stack samples
+    PROFILE_ALLOC_FRAMES = 10  # traceback depth kept per tracked allocation
+    
+    # Volume forecasting
+    FORECAST_STATE_PATH = 'memory/forecast_state.npz'
+    FORECAST_HORIZON = 24  # hourly buckets returned by /api/forecast by default
+    FORECAST_WARM_START_DAYS = 14  # hourly rollups used to fit a forecaster with no saved state
+    
+    # Emerging issue detection (per category and category x priority)
+    EMERGING_FAST_HALF_LIFE = 900  # seconds; recent-rate window
+    EMERGING_BASELINE_HALF_LIFE = 6 * 3600  # seconds; baseline-rate window
+    EMERGING_RATE_SHIFT = 3.0  # rate increase the CUSUM is tuned to detect
+    EMERGING_CUSUM_THRESHOLD = 10.0  # higher means fewer false alarms and slower detection
+    EMERGING_MIN_Z = 3.0
+    EMERGING_WARMUP = 1800  # seconds of live history before anything is flagged
+    # Batch analyses see daily created dates, so they use day-scale windows
+    EMERGING_BATCH_FAST_HALF_LIFE = 2 * 86400
+    EMERGING_BATCH_BASELINE_HALF_LIFE = 14 * 86400
+    EMERGING_BATCH_WARMUP_FRACTION = 0.5  # share of a window's date span replayed before anything is flagged
+    
+    # Near-duplicate incident clustering (MinHash/LSH over subject + description)
+    INCIDENT_SIMILARITY = 0.6  # estimated Jaccard similarity of word shingles
+    INCIDENT_RETENTION = 24 * 3600  # seconds a ticket stays in the index
+    INCIDENT_MAX_TICKETS = 50000
+    INCIDENT_MIN_SIZE = 10  # tickets before a cluster is reported as an incident
+    INCIDENT_MIN_GROWTH_PER_HOUR = 20  # arrival rate over the last 15 minutes for an incident insight
+    
+    # Ticket search (index kept next to the ticket database)
+    SEARCH_PAGE_SIZE = 20
+    SEARCH_MAX_PAGE_SIZE = 100
+    SEARCH_SYNC_INTERVAL = 2  # seconds; how often a search first indexes newly stored tickets
+    SEARCH_SAVE_INTERVAL = 300  # seconds a newly indexed ticket may wait before the index is written to disk
+    
+    # Topic extraction (hashed text features, mini-batch NMF)
+    TOPIC_COUNT = 12
+    TOPIC_HASH_FEATURES = 2 ** 16  # model memory is TOPIC_COUNT x this many floats
+    TOPIC_BATCH_SIZE = 512  # tickets per model update
+    TOPIC_FORGET_FACTOR = 0.7  # weight kept by earlier batches at each update
+    TOPIC_TOP_TERMS = 8
+    
+    # Startup (see create_app in app.py)
+    START_BACKGROUND = os.environ.get('START_BACKGROUND', '1').lower() in ('1', 'true', 'yes')
+    PREWARM_ANALYSIS = os.environ.get('PREWARM_ANALYSIS', '').lower() in ('1', 'true', 'yes')
+    
+    def __init__(self):
+        self.initialize_directories()
+    
+    @classmethod
+    def initialize_directories(cls):
+        os.makedirs(cls.UPLOAD_FOLDER, exist_ok=True)
+        os.makedirs(cls.ANALYSIS_FOLDER, exist_ok=True)
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Seeded synthetic tickets for benchmarks.
+
+Two schemas are reproduced: the live stream produced by
+RealTimeDataGenerator.generate_live_ticket and the stored sample data built
+by MemoryManager._generate_sample_tickets. The same seed and count always
+yield the same tickets; created dates are relative to `now` so the data
+stays inside the analysis windows.
+"""
+import random
+from datetime import datetime, timedelta
+
+LIVE_ISSUES = [
+    "Login authentication failed", "Payment gateway timeout", "Feature not responding",
+    "Account verification pending", "Billing discrepancy", "Performance degradation",
+    "Mobile app crashing on launch", "Data synchronization failed", "UI rendering issues",
+    "API rate limiting", "Database connection timeout", "File upload failing"
+]
+LIVE_DESCRIPTIONS = {
+    "Login authentication failed": "User unable to access account despite correct credentials. Multiple attempts made.",
+    "Payment gateway timeout": "Transaction stuck at processing stage. Customer concerned about double charge.",
+    "Feature not responding": "Specific functionality unresponsive. Tried refreshing and different browsers.",
+    "Performance degradation": "System running slower than usual. Impacting daily operations significantly.",
+}
+LIVE_CATEGORIES = ["Technical", "Billing", "Account", "Feature", "Performance", "Security"]
+LIVE_AGENTS = ["AI_Agent_1", "AI_Agent_2", "AI_Agent_3", "Support_Agent_1", "Support_Agent_2"]
+
+SAMPLE_ISSUES = [
+    "Login problems", "Payment failed", "Feature not working",
+    "Account verification", "Billing inquiry", "Performance issues",
+    "Mobile app crash", "Data sync problem", "UI/UX feedback"
+]
+SAMPLE_CATEGORIES = ["Technical", "Billing", "Account", "Feature"]
+
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+SENTIMENTS = ["Positive", "Neutral", "Negative"]
+
+def live_ticket(rng, index, now):
+    """A ticket shaped like RealTimeDataGenerator.generate_live_ticket"""
+    issue = rng.choice(LIVE_ISSUES)
+    priority = rng.choices(PRIORITIES, weights=[0.15, 0.35, 0.35, 0.15])[0]
+    created = now - timedelta(seconds=rng.randint(0, 6 * 86400))
+    detail = LIVE_DESCRIPTIONS.get(issue, "User requires immediate assistance with this issue.")
+    return {
+        'id': f"BENCH-L{index}",
+        'subject': f"{issue} - Session_{rng.randint(1000, 9999)}",
+        'description': f"Customer experiencing {issue.lower()}. Additional context: {detail}",
+        'priority': priority,
+        'category': rng.choice(LIVE_CATEGORIES),
+        'status': rng.choices(STATUSES, weights=[0.5, 0.2, 0.2, 0.1])[0],
+        'customer_sentiment': rng.choices(SENTIMENTS, weights=[0.3, 0.4, 0.3])[0],
+        'created_date': created.strftime("%Y-%m-%d %H:%M:%S"),
+        'agent_assigned': rng.choice(LIVE_AGENTS),
+        'response_time': rng.randint(5, 120),
+        'satisfaction_score': rng.randint(1, 10),
+        'urgency_level': PRIORITIES.index(priority) + 1
+    }
+
+def sample_ticket(rng, index, now):
+    """A ticket shaped like MemoryManager._generate_sample_tickets"""
+    issue = SAMPLE_ISSUES[index % len(SAMPLE_ISSUES)]
+    return {
+        "id": f"BENCH-S{index}",
+        "subject": f"{issue} - Case {index}",
+        "description": f"Customer reported issue with {issue.lower()}. Requires attention.",
+        "priority": rng.choice(PRIORITIES),
+        "status": rng.choice(STATUSES),
+        "created_date": (now - timedelta(days=rng.randint(0, 29))).strftime("%Y-%m-%d"),
+        "customer_sentiment": rng.choice(SENTIMENTS),
+        "category": rng.choice(SAMPLE_CATEGORIES),
+        "agent_assigned": f"Agent_{rng.randint(1, 5)}"
+    }
+
+SCHEMAS = {
+    'live': (live_ticket,),
+    'sample': (sample_ticket,),
+    'mixed': (live_ticket, live_ticket, live_ticket, sample_ticket),
+}
+
+def iter_tickets(count, seed=42, schema='mixed', now=None):
+    """Yield `count` tickets lazily so very large datasets never sit in memory at once"""
+    rng = random.Random(seed)
+    now = now or datetime.now().replace(microsecond=0)
+    makers = SCHEMAS[schema]
+    for index in range(count):
+        yield makers[index % len(makers)](rng, index, now)
+
+def generate_tickets(count, seed=42, schema='mixed', now=None):
+    return list(iter_tickets(count, seed, schema, now))
@@ -0,0 +1,137 @@
+"""Rolling-origin backtest of the Holt-Winters volume forecaster.
+
+Usage (from the support-insight-analyzer directory):
+    python -m benchmarks.forecast_backtest --series 1000 --days 28
+    python -m benchmarks.forecast_backtest --rollups memory/rollups.db --horizon 12
+
+Every series is stepped through its history one hourly bucket at a time; at
+each origin after --train-days the next --horizon buckets are forecast before
+the actual value is folded in. Errors are reported per horizon step against a
+seasonal-naive baseline (same hour yesterday).
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from forecasting.holt_winters import HoltWintersBank, TOTAL_SERIES
+from memory.rollup_store import RollupStore
+
+def synthetic_series(series, days, seed=42):
+    """Poisson hourly counts with a daily cycle, a weekday/weekend swing, drift and occasional bursts"""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(days * 24)
+    base = rng.uniform(1, 60, series)[:, None]
+    daily = 1 + rng.uniform(0.2, 0.8, series)[:, None] * np.sin(2 * np.pi * (hours - 9) / 24)[None, :]
+    weekend = np.where((hours // 24) % 7 >= 5, rng.uniform(0.5, 1.0, series)[:, None], 1.0)
+    drift = 1 + rng.normal(0, 0.3, series)[:, None] * hours[None, :] / len(hours)
+    bursts = 1 + (rng.random((series, len(hours))) < 0.01) * rng.uniform(1, 3, (series, len(hours)))
+    rate = np.clip(base * daily * weekend * drift * bursts, 0, None)
+    keys = [f"series:{i}" for i in range(series)]
+    return keys, rng.poisson(rate).astype(float)
+
+def rollup_series(path, days):
+    """Total and per-category hourly counts from a RollupStore's hour tier, zero-filled"""
+    store = RollupStore(path)
+    end = time.time()
+    _, buckets = store.query(end - days * 86400, end, tier='hour')
+    if not buckets:
+        raise SystemExit(f"No hourly rollups in {path}")
+    first = buckets[0]['bucket_start']
+    length = (buckets[-1]['bucket_start'] - first) // 3600 + 1
+    categories = sorted({c for b in buckets for c in b['categories']})
+    keys = [TOTAL_SERIES] + [f"category:{c}" for c in categories]
+    values = np.zeros((len(keys), length))
+    for bucket in buckets:
+        column = (bucket['bucket_start'] - first) // 3600
+        values[0, column] = bucket['tickets']
+        for row, category in enumerate(categories, start=1):
+            values[row, column] = bucket['categories'].get(category, 0)
+    return keys, values
+
+def backtest(keys, values, horizon, train_buckets, season_length=24, z=1.96, **smoothing):
+    bank = HoltWintersBank(season_length=season_length, **smoothing)
+    series, length = values.shape
+    origins = range(train_buckets, length - horizon + 1)
+    if not origins:
+        raise SystemExit("History is too short for the requested training period and horizon")
+
+    abs_errors = np.zeros(horizon)
+    sq_errors = np.zeros(horizon)
+    smape = np.zeros(horizon)
+    covered = np.zeros(horizon)
+    naive_abs_errors = np.zeros(horizon)
+    update_seconds = []
+    forecast_seconds = []
+
+    for t in range(length - horizon + 1):
+        if t in origins:
+            started = time.perf_counter()
+            mean, lower, upper = bank.forecast(horizon, z)
+            forecast_seconds.append(time.perf_counter() - started)
+
+            actual = values[:, t:t + horizon]
+            # Seasonal naive: the same hour one season earlier (repeated for longer horizons)
+            lags = t - season_length + (np.arange(horizon) % season_length)
+            naive = values[:, lags]
+            abs_errors += np.abs(mean - actual).sum(axis=0)
+            sq_errors += ((mean - actual) ** 2).sum(axis=0)
+            denominator = np.abs(mean) + np.abs(actual)
+            smape += np.where(denominator > 0, 2 * np.abs(mean - actual) / np.where(denominator > 0, denominator, 1), 0).sum(axis=0)
+            covered += ((actual >= lower) & (actual <= upper)).sum(axis=0)
+            naive_abs_errors += np.abs(naive - actual).sum(axis=0)
+
+        started = time.perf_counter()
+        bank.update(dict(zip(keys, values[:, t])), position=t % season_length)
+        update_seconds.append(time.perf_counter() - started)
+
+    count = series * len(origins)
+    mae = abs_errors / count
+    naive_mae = naive_abs_errors / count
+    return {
+        'series': series,
+        'buckets': length,
+        'origins': len(origins),
+        'horizon': [
+            {
+                'step': step + 1,
+                'mae': round(mae[step], 3),
+                'rmse': round(float(np.sqrt(sq_errors[step] / count)), 3),
+                'smape': round(smape[step] / count, 4),
+                'mase_vs_seasonal_naive': round(mae[step] / naive_mae[step], 3) if naive_mae[step] else None,
+                'interval_coverage': round(covered[step] / count, 4)
+            }
+            for step in range(horizon)
+        ],
+        'mae': round(float(mae.mean()), 3),
+        'seasonal_naive_mae': round(float(naive_mae.mean()), 3),
+        'update_ms_p50': round(float(np.median(update_seconds)) * 1000, 3),
+        'forecast_ms_p50': round(float(np.median(forecast_seconds)) * 1000, 3)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rollups', help="backtest on a RollupStore database instead of synthetic data")
+    parser.add_argument('--series', type=int, default=1000, help="synthetic series count")
+    parser.add_argument('--days', type=int, default=28)
+    parser.add_argument('--train-days', type=float, default=7)
+    parser.add_argument('--horizon', type=int, default=24)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--alpha', type=float, default=0.1)
+    parser.add_argument('--beta', type=float, default=0.02)
+    parser.add_argument('--gamma', type=float, default=0.1)
+    parser.add_argument('--phi', type=float, default=0.98)
+    args = parser.parse_args(argv)
+
+    if args.rollups:
+        keys, values = rollup_series(args.rollups, args.days)
+    else:
+        keys, values = synthetic_series(args.series, args.days, args.seed)
+
+    report = backtest(keys, values, args.horizon, int(args.train_days * 24),
+                      alpha=args.alpha, beta=args.beta, gamma=args.gamma, phi=args.phi)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""Offline HTTP load test for the Flask app, stepping up concurrency to find saturation.
+
+Usage (from the support-insight-analyzer directory):
+    python -m benchmarks.load_test --concurrency 1,2,4,8,16,32 --step-seconds 10
+    python -m benchmarks.load_test --mix "live-data=8,index=1,run-analysis=1,historical-trends=1"
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --output benchmarks/load.json
+
+Without --url a private server is started on a free local port. Each
+simulated operator keeps one HTTP connection open and picks routes from the
+weighted mix; live-data operators send `since` like the dashboard does.
+Only the standard library is used.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROUTES = {
+    'index': ('GET', '/'),
+    'live-data': ('GET', '/api/live-data'),
+    'run-analysis': ('POST', '/api/run-analysis'),
+    'historical-trends': ('GET', '/historical-trends'),
+}
+DEFAULT_MIX = 'live-data=6,index=1,run-analysis=1,historical-trends=2'
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float('inf')]
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route {name!r}; choose from {', '.join(ROUTES)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(port, log_path=None, timeout=60, env=None, path='/api/live-data'):
+    """Run the app in a child process and wait until `path` answers"""
+    code = (f"from app import create_app; "
+            f"create_app().run(host='127.0.0.1', port={port}, threaded=True, debug=False, use_reloader=False)")
+    log = open(log_path, 'w') if log_path else subprocess.DEVNULL
+    process = subprocess.Popen([sys.executable, '-c', code], cwd=APP_DIR, stdout=log, stderr=log,
+                               env=dict(os.environ, **(env or {})))
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', path)
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Server did not answer on port {port} within {timeout}s")
+
+
+class RouteStats:
+    """Latency histogram and outcome counters for one route during one step"""
+
+    def __init__(self):
+        self.latencies = []
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.statuses = {}
+        self.errors = 0
+        self.throttled = 0
+
+    def record(self, latency, status):
+        ms = latency * 1000
+        self.latencies.append(ms)
+        self.buckets[next(i for i, bound in enumerate(BUCKETS_MS) if ms <= bound)] += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status == 429:
+            self.throttled += 1
+        elif not isinstance(status, int) or status >= 400:
+            self.errors += 1
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.errors += other.errors
+        self.throttled += other.throttled
+
+    def summary(self, seconds):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+
+        def pct(p):
+            return round(latencies[min(count - 1, int(count * p / 100))], 2) if count else None
+
+        return {
+            'requests': count,
+            'rps': round(count / seconds, 1),
+            'error_rate': round(self.errors / count, 4) if count else 0,
+            'throttled': self.throttled,
+            'statuses': {str(k): v for k, v in sorted(self.statuses.items(), key=lambda x: str(x[0]))},
+            'p50_ms': pct(50),
+            'p95_ms': pct(95),
+            'p99_ms': pct(99),
+            'max_ms': round(latencies[-1], 2) if count else None,
+            'histogram_ms': {
+                ('+Inf' if bound == float('inf') else str(bound)): n
+                for bound, n in zip(BUCKETS_MS, self.buckets)
+            }
+        }
+
+
+class Operator(threading.Thread):
+    """One simulated dashboard user issuing requests back to back over a kept-alive connection"""
+
+    def __init__(self, host, port, mix, think_time, seed, stop_event):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.routes = list(mix)
+        self.weights = [mix[name] for name in self.routes]
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+        self.stop_event = stop_event
+        self.stats = {name: RouteStats() for name in self.routes}
+        self.live_version = None
+        self.conn = None
+
+    def request(self, name):
+        method, path = ROUTES[name]
+        headers = {}
+        body = None
+        if name == 'live-data' and self.live_version is not None:
+            path = f"{path}?since={self.live_version}"
+        if method == 'POST':
+            body = '{}'
+            headers['Content-Type'] = 'application/json'
+
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        self.conn.request(method, path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        data = response.read()
+        if name == 'live-data' and response.status == 200:
+            self.live_version = json.loads(data).get('version', self.live_version)
+        return response.status
+
+    def run(self):
+        while not self.stop_event.is_set():
+            name = self.rng.choices(self.routes, weights=self.weights)[0]
+            start = time.perf_counter()
+            try:
+                status = self.request(name)
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                status = type(e).__name__
+                if self.conn is not None:
+                    self.conn.close()
+                self.conn = None
+            self.stats[name].record(time.perf_counter() - start, status)
+            if self.think_time:
+                self.stop_event.wait(self.rng.expovariate(1 / self.think_time))
+        if self.conn is not None:
+            self.conn.close()
+
+def run_step(host, port, mix, concurrency, seconds, think_time, seed):
+    stop_event = threading.Event()
+    operators = [
+        Operator(host, port, mix, think_time, seed * 1000 + i, stop_event)
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for operator in operators:
+        operator.start()
+    time.sleep(seconds)
+    stop_event.set()
+    for operator in operators:
+        operator.join()
+    elapsed = time.perf_counter() - started
+
+    routes = {name: RouteStats() for name in mix}
+    total = RouteStats()
+    for operator in operators:
+        for name, stats in operator.stats.items():
+            routes[name].merge(stats)
+            total.merge(stats)
+
+    return {
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 2),
+        'total': total.summary(elapsed),
+        'routes': {name: stats.summary(elapsed) for name, stats in routes.items()}
+    }
+
+def saturation_reason(step, previous, args):
+    """Why this step counts as saturated, or None"""
+    total = step['total']
+    if total['error_rate'] > args.max_error_rate:
+        return f"error rate {total['error_rate']:.2%} over {args.max_error_rate:.2%}"
+    if args.max_p95_ms and total['p95_ms'] and total['p95_ms'] > args.max_p95_ms:
+        return f"p95 {total['p95_ms']} ms over {args.max_p95_ms} ms"
+    if previous and total['rps'] < previous['total']['rps'] * (1 + args.min_rps_gain):
+        return f"throughput gained less than {args.min_rps_gain:.0%} over concurrency {previous['concurrency']}"
+    return None
+
+def run_load_test(args):
+    mix = parse_mix(args.mix)
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        print(f"Starting app on port {port}...", file=sys.stderr)
+        server = start_server(port, args.server_log)
+
+    steps = []
+    saturation = None
+    try:
+        if args.warmup:
+            run_step(host, port, mix, 1, args.warmup, args.think_ms / 1000, args.seed)
+
+        for concurrency in args.concurrency:
+            step = run_step(host, port, mix, concurrency, args.step_seconds, args.think_ms / 1000, args.seed)
+            reason = saturation_reason(step, steps[-1] if steps else None, args)
+            step['saturated'] = reason
+            steps.append(step)
+
+            total = step['total']
+            print(f"concurrency {concurrency:>4}: {total['rps']:>8.1f} rps  p50 {total['p50_ms']} ms  "
+                  f"p95 {total['p95_ms']} ms  p99 {total['p99_ms']} ms  errors {total['error_rate']:.2%}"
+                  + (f"  SATURATED ({reason})" if reason else ''), file=sys.stderr)
+            if reason and saturation is None:
+                saturation = {'concurrency': concurrency, 'reason': reason}
+                if not args.full:
+                    break
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    healthy = [s for s in steps if not s['saturated']]
+    best = max(healthy or steps, key=lambda s: s['total']['rps']) if steps else None
+    return {
+        'target': args.url or 'local',
+        'mix': mix,
+        'step_seconds': args.step_seconds,
+        'think_ms': args.think_ms,
+        'steps': steps,
+        'saturation': saturation,
+        'recommended_concurrency': best['concurrency'] if best else None,
+        'peak_rps': best['total']['rps'] if best else None
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="target an already running server instead of starting one")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"route weights, default {DEFAULT_MIX}")
+    parser.add_argument('--concurrency', default='1,2,4,8,16,32,64', help="operator counts to step through")
+    parser.add_argument('--step-seconds', type=float, default=10)
+    parser.add_argument('--warmup', type=float, default=2, help="seconds of single-operator warmup")
+    parser.add_argument('--think-ms', type=float, default=0, help="mean pause between an operator's requests")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--max-p95-ms', type=float, default=1000)
+    parser.add_argument('--min-rps-gain', type=float, default=0.1,
+                        help="a step must raise throughput by this fraction to count as scaling")
+    parser.add_argument('--full', action='store_true', help="keep stepping after saturation")
+    parser.add_argument('--server-log', help="write the local server's output here")
+    parser.add_argument('--output', default='benchmarks/load_results.json')
+    args = parser.parse_args(argv)
+    args.concurrency = [int(c) for c in args.concurrency.split(',')]
+
+    report = run_load_test(args)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Recommended concurrency {report['recommended_concurrency']} "
+          f"({report['peak_rps']} rps); results in {args.output}", file=sys.stderr)
+
+    errors = sum(step['total']['error_rate'] > args.max_error_rate for step in report['steps'])
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
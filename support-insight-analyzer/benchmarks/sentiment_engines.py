@@ -0,0 +1,67 @@
+"""Compare throughput and label agreement of the sentiment engines.
+
+Usage (from the support-insight-analyzer directory):
+    python -m benchmarks.sentiment_engines --tickets 20000
+"""
+import argparse
+import json
+import random
+import time
+
+from agents.analysis_agent import _label
+from agents.sentiment_engines import TextBlobEngine, LexiconEngine
+
+SUBJECTS = [
+    "Login authentication failed", "Payment gateway timeout", "Feature not responding",
+    "Account verification pending", "Billing discrepancy", "Performance degradation",
+    "Mobile app crashing on launch", "Data synchronization failed", "UI rendering issues",
+    "Great support experience", "Thanks for the quick fix", "Feature request"
+]
+DETAILS = [
+    "User unable to access account despite correct credentials. Multiple attempts made.",
+    "Transaction stuck at processing stage. Customer concerned about double charge.",
+    "System running slower than usual. Impacting daily operations significantly.",
+    "Application crashes immediately after launch. Reinstall didn't resolve.",
+    "The agent was very helpful and the problem is resolved, excellent service.",
+    "Everything works now, happy with the new dashboard.",
+    "User requires immediate assistance with this issue."
+]
+
+def generate_texts(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(SUBJECTS)} - Session_{rng.randint(1000, 9999)} "
+        f"Customer experiencing an issue. {rng.choice(DETAILS)}"
+        for _ in range(count)
+    ]
+
+def time_engine(engine, texts):
+    start = time.perf_counter()
+    scores = engine.score(texts)
+    elapsed = time.perf_counter() - start
+    return scores, elapsed
+
+def run(count, seed):
+    texts = generate_texts(count, seed)
+
+    reference_scores, reference_time = time_engine(TextBlobEngine(), texts)
+    fast_scores, fast_time = time_engine(LexiconEngine(), texts)
+
+    agreement = sum(
+        _label(a) == _label(b) for a, b in zip(reference_scores, fast_scores)
+    ) / len(texts)
+
+    return {
+        'tickets': count,
+        'textblob': {'seconds': round(reference_time, 3), 'tickets_per_sec': round(count / reference_time)},
+        'lexicon': {'seconds': round(fast_time, 3), 'tickets_per_sec': round(count / fast_time)},
+        'speedup': round(reference_time / fast_time, 1),
+        'label_agreement': round(agreement, 4)
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickets', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    print(json.dumps(run(args.tickets, args.seed), indent=2))
@@ -0,0 +1,98 @@
+"""Measure start-up cost: module import, app factory and time to first HTTP response.
+
+Usage (from the support-insight-analyzer directory):
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --prewarm
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from .load_test import APP_DIR, free_port, start_server
+
+# Each snippet prints one JSON object of timings in seconds
+IMPORT_SNIPPET = """
+import json, time
+t = time.perf_counter()
+import app
+print(json.dumps({'import_app': time.perf_counter() - t}))
+"""
+
+FACTORY_SNIPPET = """
+import json, time
+import app
+t = time.perf_counter()
+app.create_app(start_background=False, prewarm=False)
+print(json.dumps({'create_app': time.perf_counter() - t}))
+"""
+
+ANALYSIS_IMPORT_SNIPPET = """
+import json, time
+t = time.perf_counter()
+from agents.analysis_agent import preload_dependencies
+imported = time.perf_counter() - t
+t = time.perf_counter()
+preload_dependencies()
+print(json.dumps({'import_analysis_agent': imported, 'load_analysis_dependencies': time.perf_counter() - t}))
+"""
+
+def run_snippet(code):
+    output = subprocess.run([sys.executable, '-c', code], cwd=APP_DIR, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(output.stderr.strip().splitlines()[-1] if output.stderr else 'snippet failed')
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def time_to_first_response(prewarm):
+    """Seconds from spawning the server process until GET / returns"""
+    port = free_port()
+    started = time.perf_counter()
+    process = start_server(port, env={'PREWARM_ANALYSIS': '1' if prewarm else '0'}, path='/')
+    elapsed = time.perf_counter() - started
+    process.terminate()
+    process.wait(timeout=10)
+    return {'first_response': elapsed}
+
+def summarize(samples):
+    keys = samples[0].keys()
+    return {
+        key: {
+            'median_ms': round(statistics.median(s[key] for s in samples) * 1000, 1),
+            'min_ms': round(min(s[key] for s in samples) * 1000, 1),
+            'max_ms': round(max(s[key] for s in samples) * 1000, 1)
+        }
+        for key in keys
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--prewarm', action='store_true', help="start the server with PREWARM_ANALYSIS=1")
+    parser.add_argument('--output', help="also write the report here")
+    args = parser.parse_args(argv)
+
+    report = {'runs': args.runs, 'prewarm': args.prewarm}
+    measurements = [
+        ('import', lambda: run_snippet(IMPORT_SNIPPET)),
+        ('factory', lambda: run_snippet(FACTORY_SNIPPET)),
+        ('analysis_dependencies', lambda: run_snippet(ANALYSIS_IMPORT_SNIPPET)),
+        ('server', lambda: time_to_first_response(args.prewarm)),
+    ]
+    for name, measure in measurements:
+        try:
+            report[name] = summarize([measure() for _ in range(args.runs)])
+        except (RuntimeError, OSError, ValueError) as e:
+            report[name] = {'error': str(e)}
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
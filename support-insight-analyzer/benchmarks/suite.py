@@ -0,0 +1,349 @@
+"""Benchmark the analysis agents, the live trend engine and the memory manager.
+
+Usage (from the support-insight-analyzer directory):
+    python -m benchmarks.suite --sizes 1000,10000,100000 --output benchmarks/results.json
+    python -m benchmarks.suite --sizes 1000 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+
+Every public method of AnalysisAgent, DynamicAnalysisEngine and MemoryManager
+is timed on seeded datasets, plus Orchestrator.run_complete_analysis end to
+end. Datasets up to 10M tickets are supported for the memory group, which
+streams inserts; the other groups hold the dataset in memory.
+
+The exit status is 1 when a benchmark regresses against --baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from app_config import Config
+from agents.analysis_agent import AnalysisAgent
+from agents.orchestrator import Orchestrator
+from memory.memory_manager import MemoryManager
+from memory.sentiment_cache import SentimentCache
+from streaming.live_buffer import LiveSnapshot
+from streaming.window_aggregates import WindowAggregates
+from .datasets import generate_tickets, iter_tickets
+
+GROUPS = ['agent', 'engine', 'memory', 'orchestrator']
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+def measure(func, repeat, setup=None, items=1, trace_memory=True):
+    """Time `repeat` calls of func(*setup()), then one more call under tracemalloc for peak memory"""
+    latencies = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - start)
+
+    peak = None
+    if trace_memory:
+        args = setup() if setup else ()
+        tracemalloc.start()
+        try:
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    latencies.sort()
+    p50 = percentile(latencies, 50)
+    return {
+        'runs': repeat,
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'items_per_sec': round(items / p50, 1) if p50 else None,
+        'peak_memory_mb': round(peak / 2**20, 3) if peak is not None else None
+    }
+
+
+class Benchmark:
+    """One timed callable; setup runs untimed before every call and returns its arguments"""
+
+    def __init__(self, group, name, func, setup=None, items=1):
+        self.group = group
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.items = items
+
+
+def agent_benchmarks(tickets, workdir, engine_name):
+    agent = AnalysisAgent(
+        sentiment_cache=SentimentCache(os.path.join(workdir, 'agent_cache.db')),
+        sentiment_engine=engine_name
+    )
+    sentiment = agent.analyze_sentiment(tickets)  # also warms the cache for the [warm] run
+    trends = agent.detect_trends(tickets)
+    priorities = agent.analyze_priorities(tickets)
+    insights = agent.generate_insights(sentiment, trends, priorities)
+    count = len(tickets)
+
+    def fresh_list():
+        # A new list defeats the per-list aggregation cache, so each run pays for aggregation
+        return (list(tickets),)
+
+    def cold_agent():
+        cache = SentimentCache(tempfile.mktemp(suffix='.db', dir=workdir))
+        return (AnalysisAgent(sentiment_cache=cache, sentiment_engine=engine_name),)
+
+    return [
+        Benchmark('agent', 'AnalysisAgent.aggregate', agent.aggregate, fresh_list, count),
+        Benchmark('agent', 'AnalysisAgent.analyze_sentiment[cold]',
+                  lambda a: a.analyze_sentiment(tickets), cold_agent, count),
+        Benchmark('agent', 'AnalysisAgent.analyze_sentiment[warm]',
+                  lambda: agent.analyze_sentiment(tickets), items=count),
+        Benchmark('agent', 'AnalysisAgent.detect_trends', agent.detect_trends, fresh_list, count),
+        Benchmark('agent', 'AnalysisAgent.analyze_priorities', agent.analyze_priorities, fresh_list, count),
+        Benchmark('agent', 'AnalysisAgent.extract_topics', lambda: agent.extract_topics(tickets), items=count),
+        Benchmark('agent', 'AnalysisAgent.generate_insights',
+                  lambda: agent.generate_insights(sentiment, trends, priorities)),
+        Benchmark('agent', 'AnalysisAgent.generate_recommendations',
+                  lambda: agent.generate_recommendations(insights)),
+    ]
+
+def engine_benchmarks(tickets):
+    # Imported here so the other groups run without Flask installed
+    from app import DynamicAnalysisEngine
+
+    engine = DynamicAnalysisEngine(window_size=Config.LIVE_TREND_WINDOW)
+    aggregates = WindowAggregates.from_tickets(tickets)
+    trends = engine.trends_from_aggregates(aggregates)
+    for _ in range(5):
+        engine.record_history(trends)
+    count = len(tickets)
+    recent = tuple(tickets[-Config.LIVE_BUFFER_SIZE:])
+    versions = iter(range(1, 2**62))
+
+    def fresh_engine():
+        return (DynamicAnalysisEngine(window_size=Config.LIVE_TREND_WINDOW),)
+
+    def apply_all(target):
+        # One commit per ticket, as the live producer does; only the version is read from snapshots
+        for version, ticket in enumerate(tickets, start=1):
+            target.apply_commit(LiveSnapshot(version), (ticket,), ())
+
+    def new_snapshot():
+        # A new version each call, so trends_for always misses its cache
+        return (LiveSnapshot(next(versions), recent, (0,) * len(recent)),)
+
+    return [
+        Benchmark('engine', 'DynamicAnalysisEngine.apply_commit', apply_all, fresh_engine, count),
+        Benchmark('engine', 'DynamicAnalysisEngine.trends_for',
+                  lambda snapshot: engine.trends_for(snapshot, len(recent)), new_snapshot, len(recent)),
+        Benchmark('engine', 'DynamicAnalysisEngine.analyze_realtime_trends',
+                  lambda: engine.analyze_realtime_trends(tickets), items=count),
+        Benchmark('engine', 'DynamicAnalysisEngine.trends_from_aggregates',
+                  lambda: engine.trends_from_aggregates(aggregates)),
+        Benchmark('engine', 'DynamicAnalysisEngine.record_history', lambda: engine.record_history(trends)),
+        Benchmark('engine', 'DynamicAnalysisEngine.detect_rising_issues',
+                  lambda: engine.detect_rising_issues(aggregates.categories)),
+        Benchmark('engine', 'DynamicAnalysisEngine.analyze_sentiment_trend',
+                  lambda: engine.analyze_sentiment_trend(aggregates.sentiments)),
+        Benchmark('engine', 'DynamicAnalysisEngine.calculate_priority_distribution',
+                  lambda: engine.calculate_priority_distribution(aggregates.priorities)),
+        Benchmark('engine', 'DynamicAnalysisEngine.calculate_response_metrics',
+                  lambda: engine.calculate_response_metrics(aggregates)),
+        Benchmark('engine', 'DynamicAnalysisEngine.predict_ticket_volume',
+                  lambda: engine.predict_ticket_volume(count)),
+    ]
+
+def populated_manager(path, size, seed, backend, analyses=0):
+    manager = MemoryManager(db_path=path, backend=backend, legacy_json_path=None, seed_sample_data=False)
+    chunk = []
+    for ticket in iter_tickets(size, seed):
+        chunk.append(ticket)
+        if len(chunk) >= Config.INGEST_BATCH_SIZE:
+            manager.add_tickets(chunk)
+            chunk = []
+    manager.add_tickets(chunk)
+    for i in range(analyses):
+        manager.save_analysis(sample_analysis(i))
+    return manager
+
+def sample_analysis(index):
+    return {
+        'tickets_analyzed': 100 + index,
+        'sentiment_analysis': {'total_positive': index % 7, 'total_negative': index % 5, 'total_neutral': 3},
+        'trend_analysis': {'category_trends': {'Technical': index % 11, 'Billing': 4}},
+        'key_insights': [{'type': ['critical', 'warning', 'info'][index % 3], 'title': 'Benchmark insight',
+                          'description': 'Synthetic analysis record', 'priority': 'High'}],
+        'recommendations': []
+    }
+
+def memory_benchmarks(size, seed, workdir, backend, analyses):
+    suffix = '.json' if backend == 'json' else '.db'
+    manager = populated_manager(os.path.join(workdir, f'memory_{size}{suffix}'), size, seed, backend, analyses)
+    since = (datetime.now() - timedelta(days=1)).isoformat()
+
+    def empty_manager():
+        path = tempfile.mktemp(suffix=suffix, dir=workdir)
+        return (MemoryManager(db_path=path, backend=backend, legacy_json_path=None, seed_sample_data=False),)
+
+    def insert_all(target):
+        chunk = []
+        for ticket in iter_tickets(size, seed):
+            chunk.append(ticket)
+            if len(chunk) >= Config.INGEST_BATCH_SIZE:
+                target.add_tickets(chunk)
+                chunk = []
+        target.add_tickets(chunk)
+
+    saved = iter(range(analyses, 2**62))
+    return [
+        Benchmark('memory', 'MemoryManager.add_tickets', insert_all, empty_manager, size),
+        Benchmark('memory', 'MemoryManager.get_recent_tickets', lambda: manager.get_recent_tickets(days=7), items=size),
+        Benchmark('memory', 'MemoryManager.get_ticket_statistics', manager.get_ticket_statistics, items=size),
+        Benchmark('memory', 'MemoryManager.save_analysis',
+                  lambda: manager.save_analysis(sample_analysis(next(saved)))),
+        Benchmark('memory', 'MemoryManager.get_historical_analyses',
+                  manager.get_historical_analyses, items=analyses),
+        Benchmark('memory', 'MemoryManager.iter_historical_analyses',
+                  lambda: sum(1 for _ in manager.iter_historical_analyses(
+                      start=since, insight_type='critical', fields=['key_insights'])),
+                  items=analyses),
+        Benchmark('memory', 'MemoryManager.get_analyses_page',
+                  lambda: manager.get_analyses_page(limit=Config.ANALYSES_PAGE_SIZE)),
+    ]
+
+def orchestrator_benchmarks(size, seed, workdir, backend, engine_name):
+    suffix = '.json' if backend == 'json' else '.db'
+    manager = populated_manager(os.path.join(workdir, f'orchestrator_{size}{suffix}'), size, seed, backend)
+    orchestrator = Orchestrator(manager)
+    orchestrator.analysis_agent = AnalysisAgent(
+        sentiment_cache=SentimentCache(os.path.join(workdir, f'orchestrator_cache_{size}.db')),
+        sentiment_engine=engine_name
+    )
+    items = len(manager.get_recent_tickets(days=7))
+    return [
+        Benchmark('orchestrator', 'Orchestrator.run_complete_analysis',
+                  orchestrator.run_complete_analysis, items=items),
+    ]
+
+def run_suite(args):
+    workdir = tempfile.mkdtemp(prefix='sia-bench-')
+    results = []
+    try:
+        for size in args.sizes:
+            benchmarks = []
+            needs_list = {'agent', 'engine'} & set(args.groups)
+            tickets = generate_tickets(size, args.seed) if needs_list else None
+            if 'agent' in args.groups:
+                benchmarks += agent_benchmarks(tickets, workdir, args.sentiment_engine)
+            if 'engine' in args.groups:
+                benchmarks += engine_benchmarks(tickets)
+            if 'memory' in args.groups:
+                benchmarks += memory_benchmarks(size, args.seed, workdir, args.backend, args.analyses)
+            if 'orchestrator' in args.groups:
+                benchmarks += orchestrator_benchmarks(size, args.seed, workdir, args.backend,
+                                                      args.sentiment_engine)
+
+            for bench in benchmarks:
+                if args.filter and args.filter not in bench.name:
+                    continue
+                stats = measure(bench.func, args.repeat, bench.setup, bench.items, not args.no_memory)
+                result = dict(group=bench.group, name=bench.name, size=size, **stats)
+                results.append(result)
+                print(f"{bench.name:<55} {size:>9}  p50 {stats['p50_ms']:>10.3f} ms  "
+                      f"p99 {stats['p99_ms']:>10.3f} ms", file=sys.stderr)
+            tickets = None
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'started': datetime.now().isoformat(),
+            'seed': args.seed,
+            'sizes': args.sizes,
+            'repeat': args.repeat,
+            'groups': args.groups,
+            'backend': args.backend,
+            'sentiment_engine': args.sentiment_engine,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'results': results
+    }
+
+def compare(report, baseline, threshold, min_delta_ms):
+    """Benchmarks whose p50 latency or peak memory grew by more than `threshold` over the baseline"""
+    previous = {(r['name'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        before = previous.get((result['name'], result['size']))
+        if before is None:
+            continue
+        delta = result['p50_ms'] - before['p50_ms']
+        if delta > min_delta_ms and result['p50_ms'] > before['p50_ms'] * (1 + threshold):
+            regressions.append(dict(name=result['name'], size=result['size'], metric='p50_ms',
+                                    baseline=before['p50_ms'], current=result['p50_ms']))
+        if (result.get('peak_memory_mb') and before.get('peak_memory_mb')
+                and result['peak_memory_mb'] > before['peak_memory_mb'] * (1 + threshold)
+                and result['peak_memory_mb'] - before['peak_memory_mb'] > 1):
+            regressions.append(dict(name=result['name'], size=result['size'], metric='peak_memory_mb',
+                                    baseline=before['peak_memory_mb'], current=result['peak_memory_mb']))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help="comma-separated dataset sizes, e.g. 1000,10000,100000,1000000,10000000")
+    parser.add_argument('--groups', default=','.join(GROUPS), help=f"subset of {','.join(GROUPS)}")
+    parser.add_argument('--filter', help="only run benchmarks whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--backend', default='sqlite', choices=['sqlite', 'json'])
+    parser.add_argument('--sentiment-engine', default=Config.SENTIMENT_ENGINE, choices=['textblob', 'lexicon'])
+    parser.add_argument('--analyses', type=int, default=1000, help="stored analyses for the history benchmarks")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak-memory run")
+    parser.add_argument('--output', default='benchmarks/results.json')
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--save-baseline', help="also write the results here as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed relative slowdown (0.2 = 20%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help="ignore p50 changes smaller than this, to keep microbenchmarks quiet")
+    args = parser.parse_args(argv)
+    args.sizes = [int(size) for size in args.sizes.split(',')]
+    args.groups = [group.strip() for group in args.groups.split(',')]
+    unknown = set(args.groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(sorted(unknown))}")
+
+    report = run_suite(args)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(report, json.load(f), args.threshold, args.min_delta_ms)
+        report['baseline'] = args.baseline
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}", file=sys.stderr)
+
+    for regression in report.get('regressions', []):
+        print(f"REGRESSION {regression['name']} @ {regression['size']}: {regression['metric']} "
+              f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+    return 1 if report.get('regressions') else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
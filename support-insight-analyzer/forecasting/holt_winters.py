@@ -0,0 +1,280 @@
+import os
+import threading
+import time
+import logging
+from collections import Counter
+
+import numpy as np
+
+TOTAL_SERIES = 'total'
+
+class HoltWintersBank:
+    """Additive, damped-trend Holt-Winters state for many series, stepped together one bucket at a time
+
+    Each series is one row of the state arrays, so an update or a forecast
+    over thousands of series is a handful of numpy operations.
+    """
+
+    def __init__(self, season_length=24, alpha=0.1, beta=0.02, gamma=0.1, phi=0.98, error_decay=0.05):
+        self.season_length = season_length
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.phi = phi                    # trend damping; keeps long horizons from running away
+        self.error_decay = error_decay    # weight of the newest squared error in the variance estimate
+        self.keys = []
+        self._rows = {}
+        self.steps = 0                    # buckets observed
+        self.next_position = 0            # season slot of the next bucket
+        self.level = np.zeros(0)
+        self.trend = np.zeros(0)
+        self.season = np.zeros((0, season_length))
+        self.error_var = np.zeros(0)
+        self.observed = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def find(self, key):
+        return self._rows.get(key)
+
+    def _add_series(self, keys):
+        """Append fresh rows for new series in one allocation"""
+        for key in keys:
+            self._rows[key] = len(self.keys)
+            self.keys.append(key)
+        count = len(keys)
+        self.level = np.concatenate([self.level, np.zeros(count)])
+        self.trend = np.concatenate([self.trend, np.zeros(count)])
+        self.season = np.vstack([self.season, np.zeros((count, self.season_length))])
+        self.error_var = np.concatenate([self.error_var, np.zeros(count)])
+        self.observed = np.concatenate([self.observed, np.zeros(count, dtype=np.int64)])
+
+    def update(self, values, position=None):
+        """Fold one closed bucket into every series
+
+        `values` is {key: count}; series missing from it count as 0. `position`
+        is the bucket's season slot, defaulting to the slot after the last update.
+        """
+        new_keys = [key for key in values if key not in self._rows]
+        if new_keys:
+            self._add_series(new_keys)
+        y = np.zeros(len(self.keys))
+        for key, value in values.items():
+            y[self._rows[key]] = value
+
+        if position is None:
+            position = self.next_position
+        season = self.season[:, position]
+        # During a series' first season the level is a running mean and each
+        # seasonal slot is set straight from its deviation
+        warming = self.observed < self.season_length
+
+        # One-step-ahead error before the update feeds the interval width
+        predicted = self.level + self.phi * self.trend + season
+        error = y - predicted
+        fitted = ~warming
+        self.error_var[fitted] += self.error_decay * (error[fitted] ** 2 - self.error_var[fitted])
+
+        damped_trend = self.phi * self.trend
+        level = self.alpha * (y - season) + (1 - self.alpha) * (self.level + damped_trend)
+        trend = self.beta * (level - self.level) + (1 - self.beta) * damped_trend
+        self.season[:, position] = self.gamma * (y - level) + (1 - self.gamma) * season
+
+        if warming.any():
+            running = self.level[warming] + (y[warming] - self.level[warming]) / (self.observed[warming] + 1)
+            level[warming] = running
+            trend[warming] = 0.0
+            self.season[warming, position] = y[warming] - running
+
+            # Completing the first season: re-centre the seasonal slots on the final mean
+            done = warming & (self.observed + 1 == self.season_length)
+            if done.any():
+                offset = self.season[done].mean(axis=1)
+                self.season[done] -= offset[:, None]
+                level[done] += offset
+
+        self.level = level
+        self.trend = trend
+
+        self.observed += 1
+        self.steps += 1
+        self.next_position = (position + 1) % self.season_length
+
+    def forecast(self, horizon, z=1.96):
+        """(mean, lower, upper) arrays of shape (series, horizon), clipped at zero"""
+        steps = np.arange(1, horizon + 1)
+        damping = np.cumsum(self.phi ** steps)                      # phi + phi^2 + ... + phi^h
+        positions = (self.next_position + steps - 1) % self.season_length
+        mean = self.level[:, None] + self.trend[:, None] * damping + self.season[:, positions]
+
+        # Variance grows with the horizon as level and trend errors accumulate
+        growth = 1 + np.concatenate([[0], np.cumsum((self.alpha * (1 + self.beta * steps[:-1])) ** 2)])
+        spread = z * np.sqrt(self.error_var[:, None] * growth)
+        return np.maximum(mean, 0), np.maximum(mean - spread, 0), mean + spread
+
+    def state(self):
+        return {
+            'keys': np.array(self.keys, dtype=str),
+            'steps': np.array(self.steps),
+            'next_position': np.array(self.next_position),
+            'level': self.level,
+            'trend': self.trend,
+            'season': self.season,
+            'error_var': self.error_var,
+            'observed': self.observed,
+        }
+
+    def load_state(self, state):
+        if state['season'].shape[1] != self.season_length:
+            raise ValueError("Saved state has a different season length")
+        self.keys = [str(key) for key in state['keys']]
+        self._rows = {key: i for i, key in enumerate(self.keys)}
+        self.steps = int(state['steps'])
+        self.next_position = int(state['next_position'])
+        self.level = state['level'].astype(float)
+        self.trend = state['trend'].astype(float)
+        self.season = state['season'].astype(float)
+        self.error_var = state['error_var'].astype(float)
+        self.observed = state['observed'].astype(np.int64)
+
+
+class VolumeForecaster:
+    """Hourly ticket volume, total and per category, forecast from incrementally updated Holt-Winters state
+
+    Tickets are counted into the open bucket; when it closes, every series is
+    stepped once and the state is saved, so nothing is ever refit over history.
+    """
+
+    def __init__(self, path=None, bucket_seconds=3600, season_length=24, max_gap_buckets=None, **smoothing):
+        self.path = path
+        self.bucket_seconds = bucket_seconds
+        self.max_gap_buckets = max_gap_buckets or season_length * 7
+        self.bank = HoltWintersBank(season_length=season_length, **smoothing)
+        self.logger = logging.getLogger('volume_forecaster')
+        self._lock = threading.Lock()
+        self._open_start = None
+        self._open = Counter()
+        self.last_closed = {}
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as state:
+                self.bank.load_state(state)
+                self._open_start = int(state['open_start']) if 'open_start' in state else None
+            self.logger.info(f"Loaded forecast state for {len(self.bank)} series")
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable forecast state {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, open_start=np.array(self._open_start), **self.bank.state())
+        os.replace(tmp_path, self.path)
+
+    @property
+    def fitted(self):
+        return self.bank.steps > 0
+
+    def _bucket(self, now):
+        return int(now) - int(now) % self.bucket_seconds
+
+    def _roll_to(self, now):
+        bucket = self._bucket(now)
+        if self._open_start is None:
+            self._open_start = bucket
+            return
+        if bucket <= self._open_start:
+            return
+
+        # Close the open bucket, then the idle buckets since (at most max_gap_buckets of them)
+        self._close(self._open, self._open_start)
+        idle_from = max(self._open_start + self.bucket_seconds, bucket - self.max_gap_buckets * self.bucket_seconds)
+        for idle_start in range(idle_from, bucket, self.bucket_seconds):
+            self._close(Counter(), idle_start)
+        self._open_start = bucket
+        self._open = Counter()
+        self._save()
+
+    def _close(self, counts, bucket_start):
+        values = dict(counts)
+        values.setdefault(TOTAL_SERIES, 0)
+        # Seasonal slot follows the clock (hour of day), so skipped idle buckets keep the phase
+        self.bank.update(values, position=(bucket_start // self.bucket_seconds) % self.bank.season_length)
+        self.last_closed = values
+
+    def add_tickets(self, tickets, now=None):
+        with self._lock:
+            self._roll_to(now or time.time())
+            for ticket in tickets:
+                self._open[TOTAL_SERIES] += 1
+                self._open[f"category:{ticket['category']}"] += 1
+
+    def flush(self, now=None):
+        """Close the open bucket if its hour has passed"""
+        with self._lock:
+            self._roll_to(now or time.time())
+
+    def warm_start(self, buckets):
+        """Fit from stored hourly history, oldest first: [(bucket_start, tickets, {category: count})]
+
+        Only used when there is no saved state; afterwards the state advances incrementally.
+        """
+        with self._lock:
+            if self.fitted:
+                return
+            previous = None
+            for bucket_start, total, categories in buckets:
+                if previous is not None:
+                    idle_from = max(previous + self.bucket_seconds,
+                                    bucket_start - self.max_gap_buckets * self.bucket_seconds)
+                    for idle_start in range(idle_from, bucket_start, self.bucket_seconds):
+                        self._close(Counter(), idle_start)
+                counts = {f"category:{c}": n for c, n in categories.items()}
+                counts[TOTAL_SERIES] = total
+                self._close(counts, bucket_start)
+                previous = bucket_start
+            if previous is not None:
+                self._open_start = previous + self.bucket_seconds
+                self._save()
+                self.logger.info(f"Warm-started {len(self.bank)} series from {self.bank.steps} hourly buckets")
+
+    def forecast(self, horizon=24, series=None, z=1.96):
+        """{series: {bucket_starts, predicted, lower, upper}} for the next `horizon` buckets"""
+        with self._lock:
+            if not self.fitted:
+                return {}
+            mean, lower, upper = self.bank.forecast(horizon, z)
+            keys = list(self.bank.keys)
+            start = (self._open_start or self._bucket(time.time()))
+        wanted = set(series) if series else None
+        bucket_starts = [start + i * self.bucket_seconds for i in range(horizon)]
+        return {
+            key: {
+                'bucket_starts': bucket_starts,
+                'predicted': np.round(mean[i], 2).tolist(),
+                'lower': np.round(lower[i], 2).tolist(),
+                'upper': np.round(upper[i], 2).tolist()
+            }
+            for i, key in enumerate(keys)
+            if wanted is None or key in wanted
+        }
+
+    def predict_next(self, series=TOTAL_SERIES):
+        """Forecast for the bucket currently filling, or None before the first bucket closes"""
+        with self._lock:
+            row = self.bank.find(series)
+            if row is None:
+                return None
+            mean, lower, upper = self.bank.forecast(1)
+            return {
+                'predicted': float(mean[row, 0]),
+                'lower': float(lower[row, 0]),
+                'upper': float(upper[row, 0]),
+                'last_observed': self.last_closed.get(series),
+                'observed_buckets': int(self.bank.observed[row])
+            }
@@ -0,0 +1,131 @@
+import queue
+import random
+import threading
+import time
+import logging
+from datetime import datetime
+
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+SENTIMENTS = ["Positive", "Neutral", "Negative"]
+REQUIRED_FIELDS = ['subject', 'description', 'priority', 'category', 'created_date']
+DATE_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"]
+
+class TicketValidationError(ValueError):
+    """A record does not match the ticket schema"""
+
+
+class IngestBackpressure(Exception):
+    """The writer is behind; the caller should retry later"""
+
+
+def _parse_date(value):
+    value = str(value).split('.')[0].rstrip('Z')
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise TicketValidationError(f"Unrecognised created_date: {value!r}")
+
+def normalize_ticket(record):
+    """Validate a record against the live ticket schema and fill derived fields"""
+    if not isinstance(record, dict):
+        raise TicketValidationError("Record must be a JSON object")
+
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) in (None, '')]
+    if missing:
+        raise TicketValidationError(f"Missing field(s): {', '.join(missing)}")
+
+    priority = record['priority']
+    if priority not in PRIORITIES:
+        raise TicketValidationError(f"Invalid priority: {priority!r}")
+
+    status = record.get('status') or 'Open'
+    if status not in STATUSES:
+        raise TicketValidationError(f"Invalid status: {status!r}")
+
+    sentiment = record.get('customer_sentiment') or 'Neutral'
+    if sentiment not in SENTIMENTS:
+        raise TicketValidationError(f"Invalid customer_sentiment: {sentiment!r}")
+
+    try:
+        response_time = int(record.get('response_time') or 0)
+        satisfaction = record.get('satisfaction_score')
+        satisfaction = int(satisfaction) if satisfaction not in (None, '') else None
+    except (TypeError, ValueError):
+        raise TicketValidationError("response_time and satisfaction_score must be integers")
+
+    created = _parse_date(record['created_date'])
+    return {
+        'id': str(record.get('id') or f"TKT-{int(time.time())}{random.randint(100000, 999999)}"),
+        'subject': str(record['subject']),
+        'description': str(record['description']),
+        'priority': priority,
+        'category': str(record['category']),
+        'status': status,
+        'customer_sentiment': sentiment,
+        'created_date': created.strftime("%Y-%m-%d %H:%M:%S"),
+        'agent_assigned': str(record.get('agent_assigned') or 'Unassigned'),
+        'response_time': response_time,
+        'satisfaction_score': satisfaction,
+        'urgency_level': PRIORITIES.index(priority) + 1
+    }
+
+
+class BatchIngestor:
+    """Bounded queue of ticket batches drained by one writer thread
+
+    `on_idle`, if given, runs on the writer whenever no batch has arrived for
+    `idle_interval` seconds.
+    """
+
+    def __init__(self, sink, max_queued_batches=8, on_idle=None, idle_interval=30):
+        self.sink = sink  # called with one list of tickets per batch
+        self.on_idle = on_idle
+        self.idle_interval = idle_interval
+        self.logger = logging.getLogger('batch_ingestor')
+        self._queue = queue.Queue(maxsize=max_queued_batches)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.batches_written = 0
+        self.tickets_written = 0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, name='ingest-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, batch):
+        """Queue a batch without blocking; raises IngestBackpressure when the writer is behind"""
+        if not batch:
+            return
+        self.start()
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            raise IngestBackpressure(f"{self._queue.qsize()} batches waiting for the writer")
+
+    @property
+    def pending_batches(self):
+        return self._queue.qsize()
+
+    def _drain(self):
+        while True:
+            try:
+                batch = self._queue.get(timeout=self.idle_interval if self.on_idle else None)
+            except queue.Empty:
+                try:
+                    self.on_idle()
+                except Exception as e:
+                    self.logger.error(f"Idle task failed: {e}")
+                continue
+            try:
+                self.sink(batch)
+                self.batches_written += 1
+                self.tickets_written += len(batch)
+            except Exception as e:
+                self.logger.error(f"Failed to write batch of {len(batch)} tickets: {e}")
+            finally:
+                self._queue.task_done()
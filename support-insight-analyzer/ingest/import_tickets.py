@@ -0,0 +1,228 @@
+"""Stream a CSV or NDJSON ticket export into MemoryManager in bounded memory.
+
+Usage (from the support-insight-analyzer directory):
+    python -m ingest.import_tickets exports/tickets.csv --max-rss-mb 512
+    python -m ingest.import_tickets exports/tickets.ndjson --map "Assignee=agent_assigned"
+
+Tickets are written to the SQLite store. Progress is checkpointed after
+every chunk; rerunning the same command resumes where the previous run
+stopped.
+"""
+import argparse
+import csv
+import gc
+import hashlib
+import json
+import os
+import resource
+import sys
+import time
+import logging
+
+from memory.memory_manager import MemoryManager
+from .batch_ingestor import TicketValidationError, normalize_ticket
+
+# Common export column names -> ticket fields
+DEFAULT_COLUMN_MAP = {
+    'ticket_id': 'id', 'ticket id': 'id', 'key': 'id',
+    'title': 'subject', 'summary': 'subject',
+    'body': 'description', 'details': 'description',
+    'severity': 'priority',
+    'type': 'category', 'issue_type': 'category',
+    'state': 'status',
+    'sentiment': 'customer_sentiment',
+    'created': 'created_date', 'created_at': 'created_date', 'opened_at': 'created_date',
+    'assignee': 'agent_assigned', 'agent': 'agent_assigned', 'assigned_to': 'agent_assigned',
+}
+
+MIN_CHUNK_SIZE = 100
+
+logger = logging.getLogger('import_tickets')
+
+
+class OffsetLineReader:
+    """Iterates decoded lines of a binary file while tracking the byte offset consumed"""
+
+    def __init__(self, f):
+        self.f = f
+        self.offset = f.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.f.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8', errors='replace')
+
+
+def current_rss_mb():
+    """Resident set size of this process; falls back to peak RSS where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def load_checkpoint(path, fingerprint):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('fingerprint') != fingerprint:
+        logger.warning("Checkpoint belongs to a different source file; starting over")
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def map_record(record, column_map):
+    mapped = {}
+    for column, value in record.items():
+        if column is None:
+            continue
+        key = column.strip()
+        field = column_map.get(key) or column_map.get(key.lower()) or key.lower()
+        mapped[field] = value
+    return mapped
+
+
+def iter_records(path, fmt, offset):
+    """Yield (record, byte offset after the record) starting at `offset`
+
+    CSV rows are yielded as dicts; NDJSON lines are yielded unparsed so a bad
+    line can be rejected without aborting the import.
+    """
+    f = open(path, 'rb')
+    try:
+        if fmt == 'csv':
+            header = next(csv.reader([f.readline().decode('utf-8-sig')]))
+            f.seek(max(offset, f.tell()))
+            lines = OffsetLineReader(f)
+            for row in csv.reader(lines):
+                if row:
+                    yield dict(zip(header, row)), lines.offset
+        else:
+            f.seek(offset)
+            lines = OffsetLineReader(f)
+            for line in lines:
+                if line.strip():
+                    yield line, lines.offset
+    finally:
+        f.close()
+
+
+def run_import(args):
+    column_map = dict(DEFAULT_COLUMN_MAP)
+    for mapping in args.map or []:
+        source, _, target = mapping.partition('=')
+        column_map[source.strip()] = target.strip()
+
+    fmt = args.format or ('csv' if args.source.lower().endswith('.csv') else 'ndjson')
+    fingerprint = source_fingerprint(args.source)
+    checkpoint_path = args.checkpoint or f"{args.source}.import-checkpoint"
+    checkpoint = load_checkpoint(checkpoint_path, fingerprint) or {
+        'fingerprint': fingerprint, 'offset': 0, 'rows': 0, 'imported': 0, 'rejected': 0
+    }
+    if checkpoint['rows']:
+        logger.info(f"Resuming after {checkpoint['rows']} rows (byte offset {checkpoint['offset']})")
+
+    # SQLite only: the JSON backend rewrites its whole file on every chunk
+    memory_manager = MemoryManager(db_path=args.db, backend='sqlite', seed_sample_data=False)
+    id_prefix = hashlib.sha1(fingerprint.encode()).hexdigest()[:8]
+
+    chunk_size = args.chunk_size
+    chunk = []
+    started = time.time()
+    rows_this_run = 0
+    last_report = started
+
+    def flush(offset):
+        nonlocal chunk, chunk_size, last_report
+        if chunk:
+            memory_manager.add_tickets(chunk)
+            checkpoint['imported'] += len(chunk)
+        checkpoint['offset'] = offset
+        save_checkpoint(checkpoint_path, checkpoint)
+        chunk = []
+
+        rss = current_rss_mb()
+        if rss > args.max_rss_mb and chunk_size > MIN_CHUNK_SIZE:
+            gc.collect()
+            chunk_size = max(MIN_CHUNK_SIZE, chunk_size // 2)
+            logger.warning(f"RSS {rss:.0f} MB over {args.max_rss_mb} MB ceiling; chunk size now {chunk_size}")
+
+        now = time.time()
+        if now - last_report >= args.report_every:
+            rate = rows_this_run / (now - started) if now > started else 0
+            logger.info(f"{checkpoint['rows']} rows, {checkpoint['imported']} imported, "
+                        f"{checkpoint['rejected']} rejected, {rate:,.0f} rows/s, RSS {rss:.0f} MB")
+            last_report = now
+
+    offset = checkpoint['offset']
+    for record, offset in iter_records(args.source, fmt, checkpoint['offset']):
+        checkpoint['rows'] += 1
+        rows_this_run += 1
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            if not isinstance(record, dict):
+                raise TicketValidationError("Record must be a JSON object")
+            record = map_record(record, column_map)
+            # Deterministic ids keep re-imported rows idempotent after a resume
+            if not record.get('id'):
+                record['id'] = f"IMP-{id_prefix}-{checkpoint['rows']}"
+            chunk.append(normalize_ticket(record))
+        except (TicketValidationError, ValueError) as e:
+            checkpoint['rejected'] += 1
+            if checkpoint['rejected'] <= args.max_reported_errors:
+                logger.warning(f"Row {checkpoint['rows']}: {e}")
+
+        if len(chunk) >= chunk_size:
+            flush(offset)
+
+    flush(offset)
+    elapsed = time.time() - started
+    summary = dict(checkpoint, seconds=round(elapsed, 2),
+                   rows_per_sec=round(rows_this_run / elapsed) if elapsed else rows_this_run,
+                   rss_mb=round(current_rss_mb(), 1))
+    summary.pop('fingerprint')
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a historical ticket export into MemoryManager")
+    parser.add_argument('source', help="CSV or NDJSON export file")
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help="defaults to the file extension")
+    parser.add_argument('--db', default='memory/support_data.db')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--max-rss-mb', type=float, default=512)
+    parser.add_argument('--checkpoint', help="checkpoint file (default: <source>.import-checkpoint)")
+    parser.add_argument('--map', action='append', metavar='COLUMN=FIELD',
+                        help="map an export column to a ticket field; repeatable")
+    parser.add_argument('--report-every', type=float, default=5.0, help="seconds between progress lines")
+    parser.add_argument('--max-reported-errors', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    summary = run_import(args)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are waiting for a worker"""
+
+
+class Job:
+    def __init__(self, key=None):
+        self.id = f"JOB-{uuid.uuid4().hex[:12]}"
+        self.key = key
+        self.status = 'queued'
+        self.progress = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at
+        }
+
+
+class JobManager:
+    """Bounded worker pool for background jobs with deduplication and TTL-evicted results"""
+
+    def __init__(self, max_workers=5, result_ttl=600, max_pending=100):
+        self.result_ttl = result_ttl
+        self.max_pending = max_pending
+        self.logger = logging.getLogger('job_manager')
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, key=None):
+        """Queue func(report_progress) and return its Job; same-key submissions share one job"""
+        with self._lock:
+            self._evict_expired()
+
+            if key is not None and key in self._by_key:
+                existing = self._jobs.get(self._by_key[key])
+                if existing and existing.status != 'failed':
+                    return existing
+
+            pending = sum(1 for job in self._jobs.values() if not job.finished)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} jobs already pending")
+
+            job = Job(key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._by_key[key] = job.id
+
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job, func):
+        job.status = 'running'
+
+        def report_progress(progress):
+            job.progress = max(job.progress, min(int(progress), 99))
+
+        # Readers don't take a lock on the job, so the outcome and finished_at are set before status says it's done
+        try:
+            job.result = func(report_progress)
+            job.progress = 100
+            status = 'completed'
+        except Exception as e:
+            self.logger.error(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            status = 'failed'
+        job.finished_at = time.time()
+        job.status = status
+
+    def __len__(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def get(self, job_id):
+        with self._lock:
+            self._evict_expired()
+            return self._jobs.get(job_id)
+
+    def latest_completed(self):
+        with self._lock:
+            self._evict_expired()
+            completed = [
+                job for job in self._jobs.values()
+                if job.status == 'completed' and job.finished_at is not None
+            ]
+        return max(completed, key=lambda job: job.finished_at) if completed else None
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if job.key is not None and self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
@@ -1,106 +1,163 @@
-import json
-import pandas as pd
-from datetime import datetime, timedelta
-import os
-import logging
-
-class MemoryManager:
-    def __init__(self, db_path='memory/support_data.json'):
-        self.db_path = db_path
-        self.logger = logging.getLogger('memory_manager')
-        self.initialize_memory()
-    
-    def initialize_memory(self):
-        """Initialize memory database with sample data"""
-        if not os.path.exists(self.db_path):
-            sample_data = {
-                "tickets": self._generate_sample_tickets(),
-                "analyses": [],
-                "trends": [],
-                "system_status": {
-                    "last_analysis": None,
-                    "total_tickets_processed": 0,
-                    "system_uptime": "100%"
-                }
-            }
-            self._save_data(sample_data)
-            self.logger.info("Local memory database initialized")
-    
-    def _generate_sample_tickets(self):
-        """Generate sample support tickets for demonstration"""
-        tickets = []
-        issues = [
-            "Login problems", "Payment failed", "Feature not working", 
-            "Account verification", "Billing inquiry", "Performance issues",
-            "Mobile app crash", "Data sync problem", "UI/UX feedback"
-        ]
-        
-        priorities = ["Low", "Medium", "High", "Critical"]
-        statuses = ["Open", "In Progress", "Resolved", "Closed"]
-        
-        for i in range(100):
-            ticket = {
-                "id": f"TKT-{1000 + i}",
-                "subject": f"{issues[i % len(issues)]} - Case {i}",
-                "description": f"Customer reported issue with {issues[i % len(issues)].lower()}. Requires attention.",
-                "priority": priorities[i % len(priorities)],
-                "status": statuses[i % len(statuses)],
-                "created_date": (datetime.now() - timedelta(days=i % 30)).strftime("%Y-%m-%d"),
-                "customer_sentiment": ["Positive", "Neutral", "Negative"][i % 3],
-                "category": ["Technical", "Billing", "Account", "Feature"][i % 4],
-                "agent_assigned": f"Agent_{(i % 5) + 1}"
-            }
-            tickets.append(ticket)
-        
-        return tickets
-    
-    def _save_data(self, data):
-        """Save data to JSON file"""
-        with open(self.db_path, 'w') as f:
-            json.dump(data, f, indent=2)
-    
-    def _load_data(self):
-        """Load data from JSON file"""
-        with open(self.db_path, 'r') as f:
-            return json.load(f)
-    
-    def get_recent_tickets(self, days=7):
-        """Get recent tickets from the last N days"""
-        data = self._load_data()
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
-        recent_tickets = [
-            ticket for ticket in data['tickets'] 
-            if ticket['created_date'] >= cutoff_date
-        ]
-        return recent_tickets
-    
-    def get_ticket_statistics(self):
-        """Get ticket statistics"""
-        data = self._load_data()
-        df = pd.DataFrame(data['tickets'])
-        
-        stats = {
-            'total_tickets': len(data['tickets']),
-            'open_tickets': len([t for t in data['tickets'] if t['status'] in ['Open', 'In Progress']]),
-            'critical_tickets': len([t for t in data['tickets'] if t['priority'] == 'Critical']),
-            'sentiment_distribution': df['customer_sentiment'].value_counts().to_dict(),
-            'category_distribution': df['category'].value_counts().to_dict(),
-            'priority_distribution': df['priority'].value_counts().to_dict()
-        }
-        
-        return stats
-    
-    def save_analysis(self, analysis_data):
-        """Save analysis results"""
-        data = self._load_data()
-        analysis_data['timestamp'] = datetime.now().isoformat()
-        analysis_data['id'] = f"ANA-{len(data['analyses']) + 1}"
-        data['analyses'].append(analysis_data)
-        self._save_data(data)
-        return analysis_data['id']
-    
-    def get_historical_analyses(self):
-        """Get all historical analyses"""
-        data = self._load_data()
-        return data['analyses']
\ No newline at end of file
+from datetime import datetime, timedelta
+import os
+import time
+import logging
+from monitoring.metrics import MEMORY_OPERATION_SECONDS
+from .storage import AnalysisQuery, create_storage
+
+class MemoryManager:
+    def __init__(self, db_path='memory/support_data.db', backend='sqlite',
+                 legacy_json_path='memory/support_data.json', seed_sample_data=True, search_folder=None,
+                 search_sync_interval=0):
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        self.seed_sample_data = seed_sample_data
+        self.search_folder = search_folder or f"{os.path.splitext(db_path)[0]}_search"
+        self.logger = logging.getLogger('memory_manager')
+        self.storage = create_storage(backend, db_path)
+        self.search_sync_interval = search_sync_interval  # seconds between index catch-ups with storage
+        self._search_index = None
+        self._search_synced = None
+        self.initialize_memory()
+    
+    def initialize_memory(self):
+        """Initialize memory database, migrating legacy JSON data or seeding sample data"""
+        if not self.storage.is_empty():
+            return
+
+        if (self.storage.name != 'json' and self.legacy_json_path
+                and os.path.exists(self.legacy_json_path)):
+            self.storage.migrate_from_json(self.legacy_json_path)
+            self.logger.info(f"Migrated legacy memory from {self.legacy_json_path}")
+            return
+
+        self.storage.initialize(
+            self._generate_sample_tickets() if self.seed_sample_data else [],
+            system_status={
+                "last_analysis": None,
+                "total_tickets_processed": 0,
+                "system_uptime": "100%"
+            }
+        )
+        self.logger.info("Local memory database initialized")
+    
+    def _generate_sample_tickets(self):
+        """Generate sample support tickets for demonstration"""
+        tickets = []
+        issues = [
+            "Login problems", "Payment failed", "Feature not working", 
+            "Account verification", "Billing inquiry", "Performance issues",
+            "Mobile app crash", "Data sync problem", "UI/UX feedback"
+        ]
+        
+        priorities = ["Low", "Medium", "High", "Critical"]
+        statuses = ["Open", "In Progress", "Resolved", "Closed"]
+        
+        for i in range(100):
+            ticket = {
+                "id": f"TKT-{1000 + i}",
+                "subject": f"{issues[i % len(issues)]} - Case {i}",
+                "description": f"Customer reported issue with {issues[i % len(issues)].lower()}. Requires attention.",
+                "priority": priorities[i % len(priorities)],
+                "status": statuses[i % len(statuses)],
+                "created_date": (datetime.now() - timedelta(days=i % 30)).strftime("%Y-%m-%d"),
+                "customer_sentiment": ["Positive", "Neutral", "Negative"][i % 3],
+                "category": ["Technical", "Billing", "Account", "Feature"][i % 4],
+                "agent_assigned": f"Agent_{(i % 5) + 1}"
+            }
+            tickets.append(ticket)
+        
+        return tickets
+    
+    @MEMORY_OPERATION_SECONDS.timed(operation='add_tickets')
+    def add_tickets(self, tickets):
+        """Store new or updated tickets"""
+        return self.storage.insert_tickets(tickets)
+    
+    @MEMORY_OPERATION_SECONDS.timed(operation='get_recent_tickets')
+    def get_recent_tickets(self, days=7):
+        """Get recent tickets from the last N days"""
+        cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        return self.storage.get_tickets_since(cutoff_date)
+    
+    @property
+    def search_index(self):
+        """Full-text index over the stored tickets, opened on first use"""
+        if self._search_index is None:
+            # numpy-backed, so imported only once search is used
+            from search.inverted_index import SearchIndex
+            self._search_index = SearchIndex(self.search_folder)
+        return self._search_index
+    
+    @MEMORY_OPERATION_SECONDS.timed(operation='search_tickets')
+    def search_tickets(self, query, priority=None, category=None, status=None,
+                       start=None, end=None, cursor=None, limit=20):
+        """One page of tickets ranked by BM25 relevance, plus the total match count and next cursor
+
+        priority/category/status are lists of allowed values; start and end
+        are inclusive ISO dates. Tickets written to storage are indexed
+        before the search, at most once every `search_sync_interval` seconds,
+        so results can lag the newest writes by that long.
+        """
+        from search.inverted_index import day_number
+        
+        if cursor and not str(cursor).isdigit():
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+        filters = {'priority': priority, 'category': category, 'status': status}
+        for name, value in (('start', start), ('end', end)):
+            if value:
+                filters[name] = day_number(value)
+                if filters[name] is None:
+                    raise ValueError(f"Invalid {name} date: {value!r}")
+        
+        index = self.search_index
+        now = time.monotonic()
+        if self._search_synced is None or now - self._search_synced >= self.search_sync_interval:
+            index.sync(self.storage)
+            self._search_synced = now
+        offset = int(cursor) if cursor else 0
+        total, hits = index.search(query, filters, offset, limit)
+        scores = dict(hits)
+        return {
+            "total": total,
+            "items": [dict(t, score=scores[t['id']]) for t in self.storage.get_tickets([i for i, _ in hits])],
+            "next_cursor": str(offset + limit) if offset + limit < total else None
+        }
+    
+    def save_search_index(self, max_age=0):
+        """Persist tickets indexed at least `max_age` seconds ago that are still only in memory"""
+        if self._search_index is not None:
+            self._search_index.flush_older_than(max_age)
+    
+    @MEMORY_OPERATION_SECONDS.timed(operation='get_ticket_statistics')
+    def get_ticket_statistics(self):
+        """Get ticket statistics"""
+        return self.storage.get_ticket_statistics()
+    
+    @MEMORY_OPERATION_SECONDS.timed(operation='save_analysis')
+    def save_analysis(self, analysis_data):
+        """Save analysis results"""
+        analysis_data['timestamp'] = datetime.now().isoformat()
+        return self.storage.append_analysis(analysis_data)
+    
+    @MEMORY_OPERATION_SECONDS.timed(operation='get_historical_analyses')
+    def get_historical_analyses(self):
+        """Get all historical analyses"""
+        return self.storage.get_analyses()
+    
+    def iter_historical_analyses(self, start=None, end=None, insight_type=None,
+                                 insight_priority=None, fields=None, after=0, limit=None):
+        """Lazily iterate (cursor, analysis) pairs, filtered and optionally projected"""
+        query = AnalysisQuery(start, end, insight_type, insight_priority, fields, after, limit)
+        return self.storage.iter_analyses(query)
+    
+    @MEMORY_OPERATION_SECONDS.timed(operation='get_analyses_page')
+    def get_analyses_page(self, cursor=None, limit=50, **filters):
+        """One page of historical analyses plus the cursor for the next page"""
+        after = int(cursor) if cursor else 0
+        rows = list(self.iter_historical_analyses(after=after, limit=limit + 1, **filters))
+        page = rows[:limit]
+        return {
+            "items": [analysis for _, analysis in page],
+            "next_cursor": str(page[-1][0]) if len(rows) > limit else None
+        }
\ No newline at end of file
@@ -0,0 +1,178 @@
+import json
+import sqlite3
+import threading
+import time
+import logging
+from collections import Counter
+
+# Tier name -> bucket width in seconds, finest first
+TIERS = {
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+}
+
+DEFAULT_RETENTION = {
+    'minute': 2 * 86400,
+    'hour': 90 * 86400,
+    'day': 730 * 86400,
+}
+
+def _empty_bucket():
+    return {
+        'tickets': 0,
+        'categories': Counter(),
+        'priorities': Counter(),
+        'sentiments': Counter(),
+        'response_time_sum': 0,
+        'resolved': 0,
+        'insights': [],
+        'insight_counts': Counter(),
+    }
+
+def _merge(target, source):
+    target['tickets'] += source['tickets']
+    for field in ('categories', 'priorities', 'sentiments', 'insight_counts'):
+        target[field].update(source[field])
+    target['response_time_sum'] += source['response_time_sum']
+    target['resolved'] += source['resolved']
+    if source['insights']:
+        target['insights'] = source['insights']
+
+def _decode(data):
+    bucket = json.loads(data)
+    for field in ('categories', 'priorities', 'sentiments', 'insight_counts'):
+        bucket[field] = Counter(bucket[field])
+    return bucket
+
+
+class RollupStore:
+    """Per-minute ticket aggregates on disk, downsampled into hourly and daily tiers"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rollups (
+            tier TEXT NOT NULL,
+            bucket_start INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (tier, bucket_start)
+        );
+    """
+
+    def __init__(self, path='memory/rollups.db', retention=None):
+        self.path = path
+        self.retention = dict(DEFAULT_RETENTION, **(retention or {}))
+        self.logger = logging.getLogger('rollup_store')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open_start = None
+        self._open = _empty_bucket()
+        self._conn().executescript(self.SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _roll_to(self, now):
+        """Close the open minute if `now` is past it"""
+        minute = int(now) - int(now) % TIERS['minute']
+        if self._open_start is None:
+            self._open_start = minute
+        elif minute != self._open_start:
+            self._flush_open()
+            self._open_start = minute
+            self._open = _empty_bucket()
+
+    def add_tickets(self, tickets, now=None):
+        """Count newly arrived tickets into the current minute"""
+        with self._lock:
+            self._roll_to(now or time.time())
+            bucket = self._open
+            for ticket in tickets:
+                bucket['tickets'] += 1
+                bucket['categories'][ticket['category']] += 1
+                bucket['priorities'][ticket['priority']] += 1
+                bucket['sentiments'][ticket['customer_sentiment']] += 1
+                bucket['response_time_sum'] += ticket.get('response_time', 0)
+
+    def add_changes(self, changed, now=None):
+        """Count tickets resolved during the current minute"""
+        with self._lock:
+            self._roll_to(now or time.time())
+            self._open['resolved'] += sum(1 for t in changed if t.get('status') == 'Resolved')
+
+    def set_insights(self, insights, now=None):
+        """Attach the latest insights to the current minute"""
+        with self._lock:
+            self._roll_to(now or time.time())
+            self._open['insights'] = list(insights)
+            self._open['insight_counts'] = Counter(i['title'] for i in insights)
+
+    def flush(self, now=None):
+        """Close the current minute if it has ended; call periodically so idle minutes close"""
+        with self._lock:
+            self._roll_to(now or time.time())
+
+    def _open_is_empty(self):
+        bucket = self._open
+        return not bucket['tickets'] and not bucket['resolved'] and not bucket['insights']
+
+    def _flush_open(self):
+        if self._open_is_empty():
+            return
+        bucket = self._open
+
+        conn = self._conn()
+        with conn:
+            for tier, width in TIERS.items():
+                start = self._open_start - self._open_start % width
+                if tier == 'minute':
+                    merged = bucket
+                else:
+                    row = conn.execute(
+                        'SELECT data FROM rollups WHERE tier = ? AND bucket_start = ?', (tier, start)
+                    ).fetchone()
+                    merged = _decode(row[0]) if row else _empty_bucket()
+                    _merge(merged, bucket)
+                conn.execute(
+                    'INSERT OR REPLACE INTO rollups (tier, bucket_start, data) VALUES (?, ?, ?)',
+                    (tier, start, json.dumps(merged))
+                )
+                conn.execute(
+                    'DELETE FROM rollups WHERE tier = ? AND bucket_start < ?',
+                    (tier, self._open_start - self.retention[tier])
+                )
+
+    def choose_tier(self, start, end, max_points=500):
+        """Finest tier that covers [start, end) in at most max_points buckets"""
+        for tier, width in TIERS.items():
+            if (end - start) / width <= max_points:
+                return tier
+        return 'day'
+
+    def query(self, start, end, tier=None, max_points=500):
+        """Buckets in [start, end) as dicts, oldest first; includes the open minute"""
+        tier = tier or self.choose_tier(start, end, max_points)
+        width = TIERS[tier]
+        cursor = self._conn().execute(
+            'SELECT bucket_start, data FROM rollups '
+            'WHERE tier = ? AND bucket_start >= ? AND bucket_start < ? ORDER BY bucket_start',
+            (tier, start - start % width, end)
+        )
+        buckets = {bucket_start: _decode(data) for bucket_start, data in cursor}
+
+        with self._lock:
+            if (self._open_start is not None and not self._open_is_empty()
+                    and start <= self._open_start < end):
+                open_start = self._open_start - self._open_start % width
+                target = buckets.setdefault(open_start, _empty_bucket())
+                _merge(target, self._open)
+
+        return tier, [
+            dict(bucket, bucket_start=bucket_start, width=width)
+            for bucket_start, bucket in sorted(buckets.items())
+        ]
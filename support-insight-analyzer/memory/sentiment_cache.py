@@ -0,0 +1,108 @@
+import hashlib
+import sqlite3
+import threading
+import logging
+from monitoring.metrics import SENTIMENT_CACHE_ENTRIES, SENTIMENT_CACHE_LOOKUPS
+
+class SentimentCache:
+    """Persistent polarity cache with size-bounded LRU eviction"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS polarity (
+            key TEXT PRIMARY KEY,
+            score REAL NOT NULL,
+            used INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_polarity_used ON polarity (used);
+    """
+
+    # SQLite caps the number of bound parameters per statement
+    QUERY_CHUNK = 500
+
+    def __init__(self, path='memory/sentiment_cache.db', max_entries=500000):
+        self.path = path
+        self.max_entries = max_entries
+        self.logger = logging.getLogger('sentiment_cache')
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(self.SCHEMA)
+        self._clock = self._conn.execute('SELECT COALESCE(MAX(used), 0) FROM polarity').fetchone()[0]
+        # Counted once here and kept current by put_many, so eviction never scans the table
+        self._count = self._conn.execute('SELECT COUNT(*) FROM polarity').fetchone()[0]
+        SENTIMENT_CACHE_ENTRIES.set(self._count)
+
+    @staticmethod
+    def key_for(ticket, namespace=''):
+        """Stable cache key for a ticket's subject and description"""
+        text = f"{namespace}\x00{ticket.get('subject', '')}\x00{ticket.get('description', '')}"
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys):
+        """Return {key: score} for cached keys and mark them as recently used"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock, self._conn:
+            self._clock += 1
+            for i in range(0, len(keys), self.QUERY_CHUNK):
+                chunk = keys[i:i + self.QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, score FROM polarity WHERE key IN ({placeholders})', chunk
+                ).fetchall()
+                found.update(rows)
+                if rows:
+                    self._conn.execute(
+                        f'UPDATE polarity SET used = ? WHERE key IN ({placeholders})',
+                        [self._clock] + chunk
+                    )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        SENTIMENT_CACHE_LOOKUPS.inc(len(found), result='hit')
+        SENTIMENT_CACHE_LOOKUPS.inc(len(keys) - len(found), result='miss')
+        return found
+
+    def put_many(self, scores):
+        """Store {key: score} and evict least recently used entries over the limit"""
+        if not scores:
+            return
+        with self._lock, self._conn:
+            self._clock += 1
+            rows = [(key, score, self._clock) for key, score in scores.items()]
+            inserted = self._conn.executemany(
+                'INSERT OR IGNORE INTO polarity (key, score, used) VALUES (?, ?, ?)', rows
+            ).rowcount
+            if inserted < len(rows):
+                # Some keys were already cached (another process scored them first); overwrite those
+                self._conn.executemany(
+                    'UPDATE polarity SET score = ?, used = ? WHERE key = ?',
+                    [(score, used, key) for key, score, used in rows]
+                )
+            self._count += inserted
+            self._evict()
+            SENTIMENT_CACHE_ENTRIES.set(self._count)
+
+    def _evict(self):
+        excess = self._count - self.max_entries
+        if excess > 0:
+            deleted = self._conn.execute(
+                'DELETE FROM polarity WHERE key IN '
+                '(SELECT key FROM polarity ORDER BY used LIMIT ?)', (excess,)
+            ).rowcount
+            self._count -= deleted
+            self.logger.info(f"Evicted {deleted} sentiment cache entries")
+
+    def size(self):
+        with self._lock:
+            return self._count
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0,
+            'size': self.size()
+        }
@@ -0,0 +1,384 @@
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import logging
+from collections import Counter
+
+TICKET_COLUMNS = ('id', 'created_date', 'priority', 'category', 'status', 'customer_sentiment')
+FIELD_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class AnalysisQuery:
+    """Filters, keyset cursor and projection for listing stored analyses"""
+
+    def __init__(self, start=None, end=None, insight_type=None, insight_priority=None,
+                 fields=None, after=0, limit=None):
+        self.start = start
+        self.end = end
+        self.insight_type = insight_type
+        self.insight_priority = insight_priority
+        self.fields = list(fields) if fields else None
+        self.after = after or 0
+        self.limit = limit
+
+        for field in self.fields or []:
+            if not FIELD_NAME.match(field):
+                raise ValueError(f"Invalid field name: {field!r}")
+
+    def matches(self, analysis):
+        timestamp = analysis.get('timestamp') or ''
+        if self.start and timestamp < self.start:
+            return False
+        if self.end and timestamp >= self.end:
+            return False
+        if self.insight_type or self.insight_priority:
+            return any(
+                (not self.insight_type or i.get('type') == self.insight_type)
+                and (not self.insight_priority or i.get('priority') == self.insight_priority)
+                for i in analysis.get('key_insights') or []
+            )
+        return True
+
+    def project(self, analysis):
+        if not self.fields:
+            return analysis
+        projected = {'id': analysis.get('id'), 'timestamp': analysis.get('timestamp')}
+        projected.update({f: analysis.get(f) for f in self.fields})
+        return projected
+
+
+class JSONStorage:
+    """Legacy backend that keeps everything in a single JSON document"""
+
+    name = 'json'
+
+    def __init__(self, path):
+        self.path = path
+        self.logger = logging.getLogger('storage.json')
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def _save(self, data):
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def is_empty(self):
+        return not os.path.exists(self.path)
+
+    def initialize(self, tickets, system_status=None):
+        with self._lock:
+            self._save({
+                "tickets": list(tickets),
+                "analyses": [],
+                "trends": [],
+                "system_status": system_status or {}
+            })
+
+    def insert_tickets(self, tickets):
+        with self._lock:
+            data = self._load()
+            data['tickets'].extend(tickets)
+            self._save(data)
+        return len(tickets)
+
+    def get_tickets_since(self, cutoff_date):
+        return [t for t in self._load()['tickets'] if t['created_date'] >= cutoff_date]
+
+    def get_tickets(self, ticket_ids):
+        """Tickets by id, in the order asked for; unknown ids are skipped"""
+        by_id = {t['id']: t for t in self._load()['tickets']}
+        return [by_id[i] for i in ticket_ids if i in by_id]
+
+    def iter_tickets_after(self, position, limit):
+        """Yield (position, ticket) for up to `limit` tickets stored after `position`, oldest first"""
+        tickets = self._load()['tickets']
+        for offset, ticket in enumerate(tickets[position:position + limit], start=position + 1):
+            yield offset, ticket
+
+    def get_ticket_statistics(self):
+        tickets = self._load()['tickets']
+        return _statistics_from_tickets(tickets)
+
+    def append_analysis(self, analysis_data):
+        with self._lock:
+            data = self._load()
+            analysis_data['id'] = f"ANA-{len(data['analyses']) + 1}"
+            data['analyses'].append(analysis_data)
+            self._save(data)
+        return analysis_data['id']
+
+    def get_analyses(self):
+        return self._load()['analyses']
+
+    def iter_analyses(self, query):
+        """Yield (seq, analysis) matching `query`; seq is the 1-based storage position"""
+        count = 0
+        for seq, analysis in enumerate(self._load()['analyses'], start=1):
+            if seq <= query.after or not query.matches(analysis):
+                continue
+            yield seq, query.project(analysis)
+            count += 1
+            if query.limit and count >= query.limit:
+                return
+
+
+class SQLiteStorage:
+    """SQLite backend in WAL mode with indexed ticket columns and append-only analyses"""
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tickets (
+            id TEXT PRIMARY KEY,
+            created_date TEXT NOT NULL,
+            priority TEXT,
+            category TEXT,
+            status TEXT,
+            customer_sentiment TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_tickets_created_date ON tickets (created_date);
+        CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets (priority);
+        CREATE INDEX IF NOT EXISTS idx_tickets_category ON tickets (category);
+        CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets (status);
+        CREATE TABLE IF NOT EXISTS analyses (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT UNIQUE,
+            timestamp TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses (timestamp);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.logger = logging.getLogger('storage.sqlite')
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._conn().executescript(self.SCHEMA)
+
+    def _conn(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def is_empty(self):
+        row = self._conn().execute('SELECT 1 FROM tickets LIMIT 1').fetchone()
+        return row is None
+
+    def initialize(self, tickets, system_status=None):
+        self.insert_tickets(tickets)
+        if system_status is not None:
+            self.set_meta('system_status', system_status)
+
+    def set_meta(self, key, value):
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, json.dumps(value)))
+
+    def get_meta(self, key, default=None):
+        row = self._conn().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def insert_tickets(self, tickets):
+        """Insert or replace tickets in a single transaction"""
+        rows = [
+            tuple(t.get(col) for col in TICKET_COLUMNS) + (json.dumps(t),)
+            for t in tickets
+        ]
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO tickets '
+                '(id, created_date, priority, category, status, customer_sentiment, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+        return len(rows)
+
+    def get_tickets_since(self, cutoff_date):
+        cursor = self._conn().execute(
+            'SELECT data FROM tickets WHERE created_date >= ?', (cutoff_date,)
+        )
+        return [json.loads(row[0]) for row in cursor]
+
+    def get_tickets(self, ticket_ids):
+        """Tickets by id, in the order asked for; unknown ids are skipped"""
+        ticket_ids = list(ticket_ids)
+        if not ticket_ids:
+            return []
+        placeholders = ','.join('?' * len(ticket_ids))
+        cursor = self._conn().execute(f'SELECT id, data FROM tickets WHERE id IN ({placeholders})', ticket_ids)
+        by_id = {ticket_id: json.loads(data) for ticket_id, data in cursor}
+        return [by_id[i] for i in ticket_ids if i in by_id]
+
+    def iter_tickets_after(self, position, limit):
+        """Yield (rowid, ticket) for up to `limit` tickets written after rowid `position`
+
+        INSERT OR REPLACE gives a replaced ticket a new, higher rowid, so this
+        also returns tickets updated since `position`.
+        """
+        cursor = self._conn().execute(
+            'SELECT rowid, data FROM tickets WHERE rowid > ? ORDER BY rowid LIMIT ?', (position, limit)
+        )
+        for rowid, data in cursor:
+            yield rowid, json.loads(data)
+
+    def _group_counts(self, column):
+        # column is always one of TICKET_COLUMNS, never user input
+        cursor = self._conn().execute(
+            f'SELECT {column}, COUNT(*) AS n FROM tickets GROUP BY {column} ORDER BY n DESC'
+        )
+        return {value: count for value, count in cursor}
+
+    def get_ticket_statistics(self):
+        conn = self._conn()
+        total = conn.execute('SELECT COUNT(*) FROM tickets').fetchone()[0]
+        open_tickets = conn.execute(
+            "SELECT COUNT(*) FROM tickets WHERE status IN ('Open', 'In Progress')"
+        ).fetchone()[0]
+        critical = conn.execute(
+            "SELECT COUNT(*) FROM tickets WHERE priority = 'Critical'"
+        ).fetchone()[0]
+
+        return {
+            'total_tickets': total,
+            'open_tickets': open_tickets,
+            'critical_tickets': critical,
+            'sentiment_distribution': self._group_counts('customer_sentiment'),
+            'category_distribution': self._group_counts('category'),
+            'priority_distribution': self._group_counts('priority')
+        }
+
+    def append_analysis(self, analysis_data):
+        conn = self._conn()
+        with self._write_lock, conn:
+            cursor = conn.execute(
+                "INSERT INTO analyses (timestamp, data) VALUES (?, '{}')",
+                (analysis_data.get('timestamp'),)
+            )
+            analysis_data['id'] = f"ANA-{cursor.lastrowid}"
+            conn.execute(
+                'UPDATE analyses SET id = ?, data = ? WHERE seq = ?',
+                (analysis_data['id'], json.dumps(analysis_data), cursor.lastrowid)
+            )
+        return analysis_data['id']
+
+    def get_analyses(self):
+        cursor = self._conn().execute('SELECT data FROM analyses ORDER BY seq')
+        return [json.loads(row[0]) for row in cursor]
+
+    def iter_analyses(self, query):
+        """Lazily yield (seq, analysis) matching `query` in storage order
+
+        With a projection, SQLite extracts just the requested fields so the
+        full analysis bodies are never deserialized in Python.
+        """
+        params = []
+        if query.fields:
+            parts = ["'id', id", "'timestamp', timestamp"]
+            for field in query.fields:
+                parts.append('?, json_extract(data, ?)')
+                params.extend([field, f'$.{field}'])
+            select = f"json_object({', '.join(parts)})"
+        else:
+            select = 'data'
+
+        clauses = ['seq > ?']
+        params.append(query.after)
+        if query.start:
+            clauses.append('timestamp >= ?')
+            params.append(query.start)
+        if query.end:
+            clauses.append('timestamp < ?')
+            params.append(query.end)
+        if query.insight_type or query.insight_priority:
+            conditions = []
+            if query.insight_type:
+                conditions.append("json_extract(value, '$.type') = ?")
+                params.append(query.insight_type)
+            if query.insight_priority:
+                conditions.append("json_extract(value, '$.priority') = ?")
+                params.append(query.insight_priority)
+            clauses.append(
+                f"EXISTS (SELECT 1 FROM json_each(data, '$.key_insights') WHERE {' AND '.join(conditions)})"
+            )
+
+        sql = f"SELECT seq, {select} FROM analyses WHERE {' AND '.join(clauses)} ORDER BY seq"
+        if query.limit:
+            sql += ' LIMIT ?'
+            params.append(query.limit)
+
+        for seq, data in self._conn().execute(sql, params):
+            yield seq, json.loads(data)
+
+    def migrate_from_json(self, json_path):
+        """One-shot import of a legacy support_data.json file"""
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+
+        tickets = data.get('tickets', [])
+        self.insert_tickets(tickets)
+
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO analyses (id, timestamp, data) VALUES (?, ?, ?)',
+                [(a.get('id'), a.get('timestamp'), json.dumps(a)) for a in data.get('analyses', [])]
+            )
+        if 'system_status' in data:
+            self.set_meta('system_status', data['system_status'])
+
+        self.logger.info(f"Migrated {len(tickets)} tickets from {json_path}")
+        return len(tickets)
+
+
+def _statistics_from_tickets(tickets):
+    def counts(field):
+        return dict(Counter(t.get(field) for t in tickets).most_common())
+
+    return {
+        'total_tickets': len(tickets),
+        'open_tickets': len([t for t in tickets if t['status'] in ['Open', 'In Progress']]),
+        'critical_tickets': len([t for t in tickets if t['priority'] == 'Critical']),
+        'sentiment_distribution': counts('customer_sentiment'),
+        'category_distribution': counts('category'),
+        'priority_distribution': counts('priority')
+    }
+
+
+BACKENDS = {
+    'json': JSONStorage,
+    'sqlite': SQLiteStorage,
+}
+
+
+def create_storage(backend, path):
+    """Instantiate the storage backend registered under `backend`"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return BACKENDS[backend](path)
+
+
+if __name__ == '__main__':
+    # Usage: python memory/storage.py <support_data.json> <support_data.db>
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) != 3:
+        print("usage: storage.py <source.json> <target.db>")
+        sys.exit(1)
+    SQLiteStorage(sys.argv[2]).migrate_from_json(sys.argv[1])
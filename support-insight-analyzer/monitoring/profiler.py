@@ -0,0 +1,238 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import logging
+from collections import Counter
+
+PROFILE_ID = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+# Artifact name -> file suffix
+ARTIFACTS = {
+    'summary': '.json',
+    'collapsed': '.collapsed.txt',
+    'pstats': '.pstats',
+    'functions': '.functions.txt',
+    'allocations': '.allocations.txt',
+}
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """Samples Python stacks of selected threads into collapsed-stack counts
+
+    Unlike cProfile this also sees the pipeline's worker threads, which is
+    where most of an analysis runs.
+    """
+
+    def __init__(self, thread_ids, thread_prefixes=(), interval=0.005):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.thread_ids = set(thread_ids)
+        self.thread_prefixes = tuple(thread_prefixes)
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def _selected(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            name = names.get(ident, str(ident))
+            if ident in self.thread_ids or name.startswith(self.thread_prefixes):
+                yield name, frame
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for name, frame in self._selected():
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(name.split('_')[0])  # thread pool name, without the worker number
+                self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        """Brendan Gregg's folded format, ready for flamegraph.pl or speedscope"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileCapture:
+    """cProfile on the calling thread, stack sampling across workers and tracemalloc, for one block
+
+    tracemalloc is process-wide: while a capture runs every allocation in
+    every thread is traced, which slows the whole server, not just the
+    profiled run. The allocation report is the difference between snapshots
+    taken on entry and exit, so memory that was already live is left out,
+    though allocations other threads made meanwhile are still counted.
+    """
+
+    def __init__(self, thread_prefixes=(), interval=0.005, alloc_frames=10):
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler([threading.get_ident()], thread_prefixes, interval)
+        self.alloc_frames = alloc_frames
+        self.started = None
+        self.duration = None
+        self.start_snapshot = None
+        self.start_memory = 0
+        self.snapshot = None
+        self.peak_memory = None
+        self._owns_tracemalloc = False
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.alloc_frames)
+            self._owns_tracemalloc = True
+        self.start_snapshot = tracemalloc.take_snapshot()
+        self.start_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        self.started = time.perf_counter()
+        self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.sampler.stop()
+        self.duration = time.perf_counter() - self.started
+        self.snapshot = tracemalloc.take_snapshot()
+        self.peak_memory = tracemalloc.get_traced_memory()[1] - self.start_memory
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        return False
+
+    def function_report(self, limit=40):
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+    def allocation_report(self, limit=30):
+        # Net allocations made while the capture ran; memory live on entry is excluded
+        stats = self.snapshot.compare_to(self.start_snapshot, 'traceback')
+        lines = [f"Peak traced memory above entry: {self.peak_memory / 2**20:.2f} MB", '']
+        for stat in stats[:limit]:
+            lines.append(f"{stat.size_diff / 1024:+.1f} KiB in {stat.count_diff:+d} blocks")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+        return '\n'.join(lines) + '\n'
+
+
+class ProfileStore:
+    """Profiles on disk under one folder, keyed by id, keeping only the newest `max_profiles`"""
+
+    def __init__(self, folder, max_profiles=20):
+        self.folder = folder
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def path_for(self, profile_id, artifact):
+        if not PROFILE_ID.match(profile_id) or artifact not in ARTIFACTS:
+            return None
+        path = os.path.join(self.folder, profile_id + ARTIFACTS[artifact])
+        return path if os.path.exists(path) else None
+
+    def save(self, profile_id, capture, **meta):
+        summary = dict(
+            meta,
+            id=profile_id,
+            created=time.time(),
+            duration=round(capture.duration, 4),
+            stack_samples=capture.sampler.samples,
+            peak_memory_mb=round(capture.peak_memory / 2**20, 3),
+            artifacts=sorted(ARTIFACTS)
+        )
+        base = os.path.join(self.folder, profile_id)
+        with self._lock:
+            with open(base + ARTIFACTS['collapsed'], 'w') as f:
+                f.write(capture.sampler.collapsed())
+            capture.profile.dump_stats(base + ARTIFACTS['pstats'])
+            with open(base + ARTIFACTS['functions'], 'w') as f:
+                f.write(capture.function_report())
+            with open(base + ARTIFACTS['allocations'], 'w') as f:
+                f.write(capture.allocation_report())
+            # Written last: a profile is listed only once all its files exist
+            with open(base + ARTIFACTS['summary'], 'w') as f:
+                json.dump(summary, f, indent=2)
+            self._prune()
+        return summary
+
+    def list(self):
+        """Stored profile summaries, newest first"""
+        summaries = []
+        for name in os.listdir(self.folder):
+            if name.endswith(ARTIFACTS['summary']):
+                try:
+                    with open(os.path.join(self.folder, name)) as f:
+                        summaries.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return sorted(summaries, key=lambda s: s['created'], reverse=True)
+
+    def _prune(self):
+        for summary in self.list()[self.max_profiles:]:
+            for suffix in ARTIFACTS.values():
+                try:
+                    os.remove(os.path.join(self.folder, summary['id'] + suffix))
+                except OSError:
+                    pass
+
+
+class AnalysisProfiler:
+    """Decides which analysis runs to profile and stores their captures
+
+    A run is profiled when the caller asks for it, or at `sample_rate` when
+    sampling is enabled. Only one capture runs at a time; requests arriving
+    meanwhile run unprofiled.
+    """
+
+    def __init__(self, store, enabled=False, sample_rate=0.0, thread_prefixes=('stage',),
+                 interval=0.005, alloc_frames=10):
+        self.store = store
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.thread_prefixes = thread_prefixes
+        self.interval = interval
+        self.alloc_frames = alloc_frames
+        self.logger = logging.getLogger('profiler')
+        self._busy = threading.Lock()
+
+    def should_profile(self, requested=False):
+        return requested or (self.enabled and random.random() < self.sample_rate)
+
+    def run(self, func, requested=False, kind='analysis'):
+        """Call func(), profiling it if selected; a dict result gets the stored profile's id"""
+        if not self.should_profile(requested) or not self._busy.acquire(blocking=False):
+            return func()
+
+        try:
+            with ProfileCapture(self.thread_prefixes, self.interval, self.alloc_frames) as capture:
+                result = func()
+
+            profile_id = None
+            if isinstance(result, dict):
+                profile_id = result.get('analysis_id')
+            profile_id = str(profile_id or f"{kind}-{int(time.time() * 1000)}")
+            if not PROFILE_ID.match(profile_id):
+                profile_id = re.sub(r'[^A-Za-z0-9_.-]', '_', profile_id)
+
+            self.store.save(profile_id, capture, kind=kind, requested=bool(requested))
+            self.logger.info(f"Stored profile {profile_id} ({capture.duration:.2f}s)")
+            if isinstance(result, dict):
+                result['profile_id'] = profile_id
+            return result
+        finally:
+            self._busy.release()
@@ -0,0 +1,451 @@
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import time
+import logging
+from collections import Counter, defaultdict
+from datetime import date
+
+import numpy as np
+
+TOKEN = re.compile(r'[a-z0-9]+(?:_[a-z0-9]+)*')  # keeps ids like agent_3 or session_1234 whole
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it my of on or so the this to was were with".split()
+)
+# Term frequency weight of each indexed field
+FIELD_WEIGHTS = {'subject': 2, 'description': 1, 'agent_assigned': 1}
+FILTER_FIELDS = ('priority', 'category', 'status')
+EPOCH = date(1970, 1, 1)
+NO_DAY = np.iinfo(np.int32).min
+
+def tokenize(text):
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+def day_number(value):
+    """Days since 1970-01-01 for an ISO date or datetime string, or None"""
+    try:
+        return (date.fromisoformat(str(value)[:10]) - EPOCH).days
+    except ValueError:
+        return None
+
+GAP_WIDTHS = ((1, np.uint8), (2, np.uint16), (4, np.uint32))
+MAX_TF = 255
+
+def _write_segment(folder, postings, ids):
+    """Write {term: (docs, tfs)} as one immutable segment of compressed posting lists
+
+    Doc ids are stored as gaps from the previous posting of the same term,
+    packed at the narrowest of 1, 2 or 4 bytes that fits the term's largest
+    gap, so frequent terms cost about a byte per posting. Term frequencies
+    are one byte each.
+    """
+    terms = sorted(postings)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, 'ids.json'), 'w') as f:
+        json.dump(ids, f)
+    encoded_terms = [term.encode() for term in terms]
+    term_offsets = np.concatenate([[0], np.cumsum([len(t) for t in encoded_terms])]).astype(np.int64)
+    df = np.array([len(postings[t][0]) for t in terms], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(df)]).astype(np.int64)
+
+    docs = np.concatenate([postings[t][0] for t in terms]) if terms else np.zeros(0, dtype=np.int64)
+    tfs = np.concatenate([postings[t][1] for t in terms]) if terms else np.zeros(0, dtype=np.int64)
+    gaps = np.diff(docs, prepend=0)
+    gaps[starts[:-1]] = docs[starts[:-1]]  # each list starts with an absolute doc id
+
+    max_gap = np.maximum.reduceat(gaps, starts[:-1]) if terms else np.zeros(0, dtype=np.int64)
+    widths = np.select([max_gap < 1 << 8, max_gap < 1 << 16], [1, 2], 4).astype(np.uint8)
+    posting_widths = np.repeat(widths, df)
+    width_starts = np.zeros(len(terms), dtype=np.int64)  # where each term's gaps begin in its width's array
+    arrays = {}
+    for width, dtype in GAP_WIDTHS:
+        chosen = widths == width
+        counts = np.where(chosen, df, 0)
+        width_starts[chosen] = (np.cumsum(counts) - counts)[chosen]
+        arrays[f'gaps_{width}'] = gaps[posting_widths == width].astype(dtype)
+
+    arrays.update({
+        'term_blob': np.frombuffer(b''.join(encoded_terms), dtype=np.uint8),
+        'term_offsets': term_offsets,
+        'posting_starts': starts,
+        'widths': widths,
+        'width_starts': width_starts,
+        'tfs': np.minimum(tfs, MAX_TF).astype(np.uint8),
+    })
+    for name, array in arrays.items():
+        np.save(os.path.join(folder, name + '.npy'), array)
+
+
+class Segment:
+    """An immutable on-disk slice of the index, memory-mapped so only touched pages are read"""
+
+    def __init__(self, folder, first_doc, doc_count):
+        self.folder = folder
+        self.first_doc = first_doc
+        self.doc_count = doc_count
+        load = lambda name: np.load(os.path.join(folder, name + '.npy'), mmap_mode='r')
+        self.term_blob = load('term_blob')
+        self.term_offsets = load('term_offsets')
+        self.posting_starts = load('posting_starts')
+        self.widths = load('widths')
+        self.width_starts = load('width_starts')
+        self.gaps = {width: load(f'gaps_{width}') for width, _ in GAP_WIDTHS}
+        self.tfs = load('tfs')
+        self.term_count = len(self.widths)
+
+    def __len__(self):
+        return self.term_count
+
+    def term(self, index):
+        return self.term_blob[self.term_offsets[index]:self.term_offsets[index + 1]].tobytes()
+
+    def find(self, term):
+        """Position of `term` in the sorted term dictionary, by binary search, or None"""
+        key = term.encode()
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.term_count and self.term(low) == key else None
+
+    def postings_at(self, index):
+        start, end = self.posting_starts[index], self.posting_starts[index + 1]
+        first = self.width_starts[index]
+        gaps = self.gaps[int(self.widths[index])][first:first + end - start]
+        return np.cumsum(gaps, dtype=np.int64), self.tfs[start:end].astype(np.int64)
+
+    def postings(self, term):
+        index = self.find(term)
+        return self.postings_at(index) if index is not None else None
+
+    def ids(self):
+        """Ticket ids of the segment's documents, in doc order"""
+        with open(os.path.join(self.folder, 'ids.json')) as f:
+            return json.load(f)
+
+    def items(self):
+        """Every (term, docs, tfs) in term order"""
+        for index in range(self.term_count):
+            yield (self.term(index).decode(),) + self.postings_at(index)
+
+
+class SearchIndex:
+    """Incrementally maintained BM25 inverted index over ticket subject, description and agent
+
+    New tickets go to an in-memory delta that is written out as an immutable
+    segment every `flush_docs` tickets; adjacent segments are merged
+    binary-counter style so there are O(log n) of them. Documents are
+    numbered globally in arrival order and never renumbered, so a merge just
+    concatenates posting lists and drops replaced tickets. Per-document
+    filter columns (priority, category, status, day) live in flat arrays.
+    Nothing is read from disk until the first call.
+    """
+
+    def __init__(self, folder, flush_docs=20000, k1=1.2, b=0.75):
+        self.folder = folder
+        self.flush_docs = flush_docs
+        self.k1 = k1
+        self.b = b
+        self.logger = logging.getLogger('search_index')
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._delta_since = None
+
+    # Loading and persistence
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        manifest = {}
+        path = os.path.join(self.folder, 'manifest.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+
+        self.watermark = manifest.get('watermark', 0)
+        self.next_segment = manifest.get('next_segment', 1)
+        self.vocabularies = {field: manifest.get('vocabularies', {}).get(field, []) for field in FILTER_FIELDS}
+        self._codes = {field: {v: i for i, v in enumerate(values)} for field, values in self.vocabularies.items()}
+        self.segments = [
+            Segment(os.path.join(self.folder, name), first_doc, doc_count)
+            for name, first_doc, doc_count in manifest.get('segments', [])
+        ]
+        self.doc_count = self.segments[-1].first_doc + self.segments[-1].doc_count if self.segments else 0
+
+        columns = {}
+        if self.doc_count:
+            with np.load(os.path.join(self.folder, 'documents.npz')) as saved:
+                columns = {name: saved[name] for name in saved.files}
+        self._columns = {
+            'length': np.zeros(0, dtype=np.int32), 'day': np.zeros(0, dtype=np.int32),
+            'alive': np.zeros(0, dtype=bool),
+            **{field: np.zeros(0, dtype=np.int32) for field in FILTER_FIELDS}
+        }
+        self._columns.update(columns)
+        self._grow(self.doc_count)
+        self.ids = [ticket_id for segment in self.segments for ticket_id in segment.ids()]
+        self._id_to_doc = None  # built on the first update
+        self.alive_count = int(self._columns['alive'][:self.doc_count].sum())
+        self.total_length = int(self._columns['length'][:self.doc_count][self._columns['alive'][:self.doc_count]].sum())
+        self._reset_delta()
+        self._loaded = True
+        if self.doc_count:
+            self.logger.info(f"Loaded search index: {self.alive_count} tickets in {len(self.segments)} segments")
+
+    def _reset_delta(self):
+        self._delta = defaultdict(lambda: ([], []))
+        self._delta_first = self.doc_count
+        self._delta_since = None  # monotonic time the oldest unflushed ticket was added
+
+    def _grow(self, needed):
+        capacity = len(self._columns['alive'])
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            self._columns[name] = grown
+
+    def _save_state(self):
+        """Document columns and the manifest; the manifest is replaced last so a crash keeps the old state
+
+        Only called right after a flush, so the saved watermark never covers
+        tickets that exist only in the in-memory delta; those are simply
+        synced again after a restart.
+        """
+        tmp = os.path.join(self.folder, 'documents.tmp.npz')
+        np.savez(tmp, **{name: column[:self.doc_count] for name, column in self._columns.items()})
+        os.replace(tmp, os.path.join(self.folder, 'documents.npz'))
+        manifest = {
+            'watermark': self.watermark,
+            'next_segment': self.next_segment,
+            'vocabularies': self.vocabularies,
+            'segments': [[os.path.basename(s.folder), s.first_doc, s.doc_count] for s in self.segments]
+        }
+        with open(os.path.join(self.folder, 'manifest.json.tmp'), 'w') as f:
+            json.dump(manifest, f)
+        os.replace(os.path.join(self.folder, 'manifest.json.tmp'), os.path.join(self.folder, 'manifest.json'))
+
+    def _new_segment(self, postings, first_doc, doc_count):
+        folder = os.path.join(self.folder, f"segment-{self.next_segment:06d}")
+        self.next_segment += 1
+        _write_segment(folder, postings, self.ids[first_doc:first_doc + doc_count])
+        return Segment(folder, first_doc, doc_count)
+
+    def flush(self):
+        """Write the in-memory delta out as a segment and persist the index"""
+        with self._lock:
+            self._ensure_loaded()
+            os.makedirs(self.folder, exist_ok=True)
+            if self.doc_count == self._delta_first:
+                return
+            postings = {
+                term: (np.array(docs, dtype=np.int64), np.array(tfs, dtype=np.int64))
+                for term, (docs, tfs) in self._delta.items()
+            }
+            self.segments.append(self._new_segment(postings, self._delta_first, self.doc_count - self._delta_first))
+            self._reset_delta()
+            retired = self._merge_segments()
+            self._save_state()
+            for segment in retired:
+                shutil.rmtree(segment.folder, ignore_errors=True)
+
+    def flush_older_than(self, max_age):
+        """Flush the delta once its oldest ticket has waited `max_age` seconds; returns whether it did
+
+        Without this an index that gains fewer than `flush_docs` tickets is
+        never written, and is rebuilt from storage on every restart.
+        """
+        since = self._delta_since  # read unlocked so a periodic caller never waits behind a search
+        if since is None or time.monotonic() - since < max_age:
+            return False
+        self.flush()
+        return True
+
+    def _merge_segments(self):
+        """Merge the two newest segments while the newer is at least half the older's size"""
+        retired = []
+        while len(self.segments) >= 2 and self.segments[-1].doc_count * 2 >= self.segments[-2].doc_count:
+            older, newer = self.segments[-2], self.segments[-1]
+            alive = self._columns['alive']
+            merged = defaultdict(lambda: ([], []))
+            for segment in (older, newer):
+                for term, docs, tfs in segment.items():
+                    keep = alive[docs]  # replaced tickets are dropped here
+                    if keep.any():
+                        merged[term][0].append(docs[keep])
+                        merged[term][1].append(tfs[keep])
+            postings = {term: (np.concatenate(d), np.concatenate(t)) for term, (d, t) in merged.items()}
+            self.segments[-2:] = [self._new_segment(postings, older.first_doc, older.doc_count + newer.doc_count)]
+            retired += [older, newer]
+        return retired
+
+    # Updates
+
+    def _lookup_doc(self, ticket_id):
+        if self._id_to_doc is None:
+            self._id_to_doc = {ticket_id: doc for doc, ticket_id in enumerate(self.ids)}
+        return self._id_to_doc.get(ticket_id)
+
+    def add_tickets(self, tickets):
+        """Index new tickets; a ticket id seen before replaces the older version"""
+        with self._lock:
+            self._ensure_loaded()
+            columns = self._columns
+            for ticket in tickets:
+                previous = self._lookup_doc(ticket['id'])
+                if previous is not None and columns['alive'][previous]:
+                    columns['alive'][previous] = False
+                    self.alive_count -= 1
+                    self.total_length -= int(columns['length'][previous])
+
+                doc = self.doc_count
+                self._grow(doc + 1)
+                if self._delta_since is None:
+                    self._delta_since = time.monotonic()
+                counts = Counter()
+                for field, weight in FIELD_WEIGHTS.items():
+                    for token in tokenize(str(ticket.get(field) or '')):
+                        counts[token] += weight
+                for term, tf in counts.items():
+                    docs, tfs = self._delta[term]
+                    docs.append(doc)
+                    tfs.append(tf)
+
+                length = sum(counts.values())
+                columns['length'][doc] = length
+                columns['alive'][doc] = True
+                day = day_number(ticket.get('created_date'))
+                columns['day'][doc] = NO_DAY if day is None else day
+                for field in FILTER_FIELDS:
+                    columns[field][doc] = self._code(field, ticket.get(field))
+                self.ids.append(ticket['id'])
+                self._id_to_doc[ticket['id']] = doc
+                self.doc_count += 1
+                self.alive_count += 1
+                self.total_length += length
+
+            if self.doc_count - self._delta_first >= self.flush_docs:
+                self.flush()
+
+    def _code(self, field, value):
+        value = '' if value is None else str(value)
+        code = self._codes[field].get(value)
+        if code is None:
+            code = self._codes[field][value] = len(self.vocabularies[field])
+            self.vocabularies[field].append(value)
+        return code
+
+    def sync(self, storage, batch_size=5000):
+        """Index tickets written to `storage` since the last sync; returns how many were added"""
+        with self._lock:
+            self._ensure_loaded()
+            added = 0
+            while True:
+                rows = list(storage.iter_tickets_after(self.watermark, batch_size))
+                if not rows:
+                    return added
+                # Advanced first so a flush triggered by this batch persists it as covered
+                self.watermark = rows[-1][0]
+                self.add_tickets([ticket for _, ticket in rows])
+                added += len(rows)
+
+    # Queries
+
+    def _postings(self, term):
+        """All (docs, tfs) for a term across segments and the delta, in doc order"""
+        parts = [segment.postings(term) for segment in self.segments]
+        delta = self._delta.get(term)
+        if delta:
+            parts.append((np.array(delta[0], dtype=np.int64), np.array(delta[1], dtype=np.int64)))
+        parts = [p for p in parts if p is not None]
+        if not parts:
+            return None
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def _filter_mask(self, docs, filters):
+        columns = self._columns
+        mask = columns['alive'][docs]
+        for field in FILTER_FIELDS:
+            values = filters.get(field)
+            if values:
+                allowed = np.zeros(len(self._codes[field]), dtype=bool)  # lookup table by value code
+                allowed[[self._codes[field][v] for v in values if v in self._codes[field]]] = True
+                mask &= allowed[columns[field][docs]]
+        start, end = filters.get('start'), filters.get('end')
+        if start is not None or end is not None:
+            days = columns['day'][docs]
+            mask &= days != NO_DAY
+            if start is not None:
+                mask &= days >= start
+            if end is not None:
+                mask &= days <= end
+        return mask
+
+    def search(self, query, filters=None, offset=0, limit=20):
+        """(total matches, [(ticket id, score)]) ranked by BM25 for one page
+
+        `filters` may hold lists of allowed priority/category/status values and
+        inclusive `start`/`end` day numbers.
+        """
+        filters = filters or {}
+        with self._lock:
+            self._ensure_loaded()
+            if not self.alive_count:
+                return 0, []
+            average_length = self.total_length / self.alive_count
+            lengths = self._columns['length']
+            doc_parts, score_parts = [], []
+            for term in set(tokenize(query)):
+                postings = self._postings(term)
+                if postings is None:
+                    continue
+                docs, tfs = postings
+                idf = math.log(1 + (self.alive_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[docs] / average_length)
+                doc_parts.append(docs)
+                score_parts.append(idf * tfs * (self.k1 + 1) / (tfs + norm))
+            ids = self.ids
+            if not doc_parts:
+                return 0, []
+            if len(doc_parts) == 1:
+                docs, scores = doc_parts[0], score_parts[0]
+            elif sum(len(d) for d in doc_parts) * 16 > len(ids):
+                # Broad queries: a dense accumulator over all documents beats sorting the postings
+                dense = np.bincount(np.concatenate(doc_parts), weights=np.concatenate(score_parts), minlength=len(ids))
+                docs = np.flatnonzero(dense > 0)  # a boolean mask is much faster to scan than floats
+                scores = dense[docs]
+            else:
+                docs, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+                scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+            # Filtering once per matching document rather than once per posting
+            mask = self._filter_mask(docs, filters)
+            docs, scores = docs[mask], scores[mask]
+
+        total = len(docs)
+        wanted = min(offset + limit, total)
+        if wanted <= offset:
+            return total, []
+        # Only the top offset+limit are sorted; newer tickets win ties
+        if wanted < total:
+            # Ties at the cut are settled by ticket age here too, so every page agrees on the order
+            cut = -np.partition(-scores, wanted - 1)[wanted - 1]
+            above = np.flatnonzero(scores > cut)
+            tied = np.flatnonzero(scores == cut)
+            needed = wanted - len(above)
+            if needed < len(tied):
+                tied = tied[np.argpartition(-docs[tied], needed - 1)[:needed]]
+            top = np.concatenate([above, tied])
+        else:
+            top = np.arange(total)
+        top = top[np.lexsort((-docs[top], -scores[top]))][offset:wanted]
+        return total, [(ids[doc], round(float(scores[i]), 4)) for i, doc in zip(top, docs[top])]
@@ -0,0 +1,155 @@
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
+
+
+class SegmentState:
+    """Decayed counts and CUSUM statistic for one segment, advanced lazily to its latest event"""
+
+    __slots__ = ('updated', 'fast', 'baseline', 'cusum', 'onset', 'alert')
+
+    def __init__(self, now):
+        self.updated = now
+        self.fast = 0.0       # exponentially decayed count over the recent window
+        self.baseline = 0.0   # the same over the long baseline window
+        self.cusum = 0.0
+        self.onset = None     # when the CUSUM last left zero: the change-point estimate
+        self.alert = None     # event dict while the segment is emerging
+
+
+class EmergingIssueDetector:
+    """Online surge detection per category and per category x priority
+
+    Each segment keeps a recent and a baseline exponentially weighted event
+    count, plus a Poisson CUSUM testing for a `shift`-fold rate increase over
+    the baseline. A segment's state only advances when it sees a ticket, so
+    an update is O(1) however many segments exist, and reads only touch the
+    segments currently emerging.
+    """
+
+    def __init__(self, fast_half_life=900, baseline_half_life=6 * 3600, shift=3.0, threshold=10.0,
+                 min_z=3.0, min_events=5, warmup=1800, max_events=100):
+        self.fast_tau = fast_half_life / math.log(2)
+        self.baseline_tau = baseline_half_life / math.log(2)
+        self.shift = shift
+        self.log_shift = math.log(shift)
+        self.threshold = threshold    # CUSUM decision interval, in log-likelihood units
+        self.min_z = min_z
+        self.min_events = min_events
+        self.warmup = warmup          # seconds of history needed before anything is flagged
+        self.started = None
+        self.segments = {}            # (category, priority or None) -> SegmentState
+        self.active = {}              # the subset currently emerging
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.segments)
+
+    def _baseline_rate(self, state, now):
+        """Events per second expected from the baseline window, corrected for a short history"""
+        age = max(now - self.started, 1.0)
+        coverage = self.baseline_tau * (1 - math.exp(-age / self.baseline_tau))
+        # A never-seen segment still gets a small non-zero baseline
+        return max(state.baseline, 1.0) / coverage
+
+    def _z_score(self, state, rate):
+        # A Poisson stream's decayed count has mean rate*tau and variance rate*tau/2
+        expected = rate * self.fast_tau
+        return (state.fast - expected) / math.sqrt(expected / 2)
+
+    def _advance(self, key, state, now):
+        elapsed = now - state.updated
+        if elapsed <= 0:
+            return
+        # Draining before the decay uses the baseline as it stood over the interval
+        drain = (self.shift - 1) * self._baseline_rate(state, state.updated) * elapsed
+        state.cusum = max(state.cusum - drain, 0.0)
+        state.fast *= math.exp(-elapsed / self.fast_tau)
+        state.baseline *= math.exp(-elapsed / self.baseline_tau)
+        state.updated = now
+        if state.cusum == 0:
+            state.onset = None
+            if state.alert is not None:
+                state.alert = None
+                self.active.pop(key, None)
+
+    def _observe(self, key, count, now):
+        state = self.segments.get(key)
+        if state is None:
+            state = self.segments[key] = SegmentState(now)
+        self._advance(key, state, now)
+
+        rate = self._baseline_rate(state, now)
+        if state.onset is None:
+            state.onset = now
+        state.cusum += count * self.log_shift
+        state.fast += count
+        state.baseline += count
+
+        if state.alert is not None:
+            self._refresh(state, rate)
+            return None
+        if (now - self.started < self.warmup or state.cusum < self.threshold
+                or state.fast < self.min_events or self._z_score(state, rate) < self.min_z):
+            return None
+
+        category, priority = key
+        state.alert = {
+            'segment': category if priority is None else f"{category} / {priority}",
+            'category': category,
+            'priority': priority,
+            'onset': _isoformat(state.onset),
+            'detected_at': _isoformat(now)
+        }
+        self._refresh(state, rate)
+        self.active[key] = state
+        event = dict(state.alert)
+        self.events.append(event)
+        return event
+
+    def _refresh(self, state, rate):
+        z = self._z_score(state, rate)
+        state.alert['z_score'] = round(z, 2)
+        state.alert['peak_z_score'] = round(max(z, state.alert.get('peak_z_score', z)), 2)
+        state.alert['recent_count'] = round(state.fast, 1)
+        state.alert['rate_per_hour'] = round(state.fast / self.fast_tau * 3600, 2)
+        state.alert['baseline_per_hour'] = round(rate * 3600, 2)
+
+    def observe(self, category, priority, count=1, now=None):
+        """Fold `count` tickets of one category and priority; returns the segment events this raised"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.started is None:
+                self.started = now
+            events = [self._observe((category, None), count, now), self._observe((category, priority), count, now)]
+        return [event for event in events if event is not None]
+
+    def add_tickets(self, tickets, now=None):
+        """Fold newly arrived tickets in; returns events for segments that just started emerging"""
+        now = time.time() if now is None else now
+        events = []
+        for ticket in tickets:
+            events.extend(self.observe(ticket['category'], ticket['priority'], now=now))
+        return events
+
+    def emerging(self, now=None):
+        """Segments currently emerging, strongest first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for key, state in list(self.active.items()):
+                self._advance(key, state, now)
+                if state.alert is not None:
+                    self._refresh(state, self._baseline_rate(state, now))
+            alerts = [dict(state.alert) for state in self.active.values()]
+        return sorted(alerts, key=lambda alert: alert['z_score'], reverse=True)
+
+    def recent_events(self):
+        """Emerging-issue events in the order they were raised, oldest first"""
+        with self._lock:
+            return list(self.events)
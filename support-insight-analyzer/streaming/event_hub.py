@@ -0,0 +1,81 @@
+import json
+import threading
+import logging
+from collections import deque
+
+class EventHub:
+    """Fan-out of server-sent events: serialize once on publish, replay on resume"""
+
+    def __init__(self, backlog_size=500, heartbeat_interval=15):
+        self.heartbeat_interval = heartbeat_interval
+        self.logger = logging.getLogger('event_hub')
+        self._backlog = deque(maxlen=backlog_size)  # (event_id, encoded frame)
+        self._last_id = 0
+        self._condition = threading.Condition()
+        self.subscribers = 0
+
+    @staticmethod
+    def encode(event_type, data, event_id=None):
+        """Render one SSE frame"""
+        frame = f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+        return f"id: {event_id}\n{frame}" if event_id is not None else frame
+
+    def publish(self, event_type, data):
+        with self._condition:
+            self._last_id += 1
+            self._backlog.append((self._last_id, self.encode(event_type, data, self._last_id)))
+            self._condition.notify_all()
+            return self._last_id
+
+    @property
+    def last_event_id(self):
+        return self._last_id
+
+    def _events_after(self, event_id):
+        """Backlog frames newer than event_id, or None if the gap can't be replayed"""
+        if event_id > self._last_id:
+            return None  # cursor from before a server restart
+        if self._backlog and event_id < self._backlog[0][0] - 1:
+            return None
+        return [(eid, frame) for eid, frame in self._backlog if eid > event_id]
+
+    def subscribe(self, last_event_id=None, snapshot=None):
+        """Yield SSE frames forever, resuming after last_event_id when possible
+
+        `snapshot` is a callable returning the current full state; it is sent
+        to new subscribers and to those whose resume point fell out of the backlog.
+        """
+        with self._condition:
+            self.subscribers += 1
+            cursor = self._last_id
+            replay = self._events_after(last_event_id) if last_event_id is not None else None
+
+        try:
+            if replay is None:
+                if snapshot is not None:
+                    yield self.encode('snapshot', snapshot(), cursor)
+            else:
+                for eid, frame in replay:
+                    cursor = eid
+                    yield frame
+
+            while True:
+                with self._condition:
+                    if self._last_id == cursor:
+                        self._condition.wait(timeout=self.heartbeat_interval)
+                    pending = self._events_after(cursor)
+
+                if pending is None:
+                    # Slow consumer fell behind the backlog; resync with a fresh snapshot
+                    cursor = self._last_id
+                    if snapshot is not None:
+                        yield self.encode('snapshot', snapshot(), cursor)
+                elif pending:
+                    for eid, frame in pending:
+                        cursor = eid
+                        yield frame
+                else:
+                    yield ": heartbeat\n\n"
+        finally:
+            with self._condition:
+                self.subscribers -= 1
@@ -0,0 +1,240 @@
+import itertools
+import re
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from datetime import datetime
+
+import numpy as np
+
+TOKEN = re.compile(r'[a-z]+|\d+')
+MERSENNE_PRIME = (1 << 61) - 1
+SAMPLE_TICKETS = 5  # ticket ids listed per incident
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
+
+def shingles(text, size=3):
+    """Word n-grams of the lower-cased text; digit runs are collapsed so ids and session numbers don't count"""
+    tokens = ['#' if token[0].isdigit() else token for token in TOKEN.findall(text.lower())]
+    if len(tokens) <= size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures from universal hashes of CRC32 shingle hashes"""
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # Below 2**32 so a * x + b stays inside uint64 for 32-bit shingle hashes
+        self.a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+
+    def signatures(self, shingle_sets):
+        """(len(shingle_sets), num_perm) uint32 signatures, one vectorized pass for the whole batch"""
+        lengths = [max(len(s), 1) for s in shingle_sets]
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode()) for s in shingle_sets for shingle in (s or {''})),
+            dtype=np.uint64, count=sum(lengths)
+        )
+        permuted = ((hashes[:, None] * self.a + self.b) % MERSENNE_PRIME) & 0xFFFFFFFF
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        return np.minimum.reduceat(permuted, starts, axis=0).astype(np.uint32)
+
+
+class IncidentCluster:
+    """Near-duplicate tickets believed to come from one incident"""
+
+    __slots__ = ('id', 'members', 'size', 'first_seen', 'last_seen', 'arrivals', 'recent', 'categories', 'priorities',
+                 'subject')
+
+    def __init__(self, cluster_id, subject, now):
+        self.id = cluster_id
+        self.members = set()    # ticket ids still held in the index
+        self.size = 0           # every ticket ever assigned, including evicted ones
+        self.first_seen = now
+        self.last_seen = now
+        self.arrivals = deque()  # arrival times inside the growth window
+        self.recent = deque(maxlen=SAMPLE_TICKETS)  # (arrival time, ticket id) of the newest members
+        self.categories = Counter()
+        self.priorities = Counter()
+        self.subject = subject
+
+    def growth_per_hour(self, now, window):
+        while self.arrivals and self.arrivals[0] < now - window:
+            self.arrivals.popleft()
+        return len(self.arrivals) * 3600 / window
+
+    def to_dict(self, now, window):
+        return {
+            'id': self.id,
+            'subject': self.subject,
+            'size': self.size,
+            'growth_per_hour': round(self.growth_per_hour(now, window), 2),
+            'first_seen': _isoformat(self.first_seen),
+            'last_seen': _isoformat(self.last_seen),
+            'categories': dict(self.categories.most_common()),
+            'priorities': dict(self.priorities.most_common()),
+            'sample_ticket_ids': [ticket_id for _, ticket_id in self.recent if ticket_id in self.members]
+        }
+
+
+class IncidentIndex:
+    """Incremental MinHash/LSH index of ticket text that groups near-duplicates into incident clusters
+
+    A ticket's signature is split into `bands`; tickets sharing any band are
+    candidates, and candidates whose estimated Jaccard similarity reaches
+    `threshold` are near-duplicates. Lookups touch only the candidates, and
+    tickets leave the index after `retention` seconds or beyond `max_tickets`.
+    """
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.6, shingle_size=3,
+                 retention=24 * 3600, max_tickets=50000, growth_window=900, candidates_per_band=8):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.retention = retention
+        self.max_tickets = max_tickets
+        self.growth_window = growth_window
+        self.candidates_per_band = candidates_per_band
+        self.buckets = [{} for _ in range(bands)]  # band -> {band bytes: set of ticket ids}
+        self.signatures = {}                       # ticket id -> signature
+        self.subjects = {}
+        self.cluster_of = {}                       # ticket id -> IncidentCluster
+        self.clusters = {}
+        self._order = deque()                      # (inserted_at, ticket id), oldest first
+        self._next_cluster = 1
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _candidates(self, signature, exclude=None, per_band=None):
+        """(similarity, ticket id) for indexed tickets at or above the threshold, most similar first
+
+        `per_band` caps how many colliding tickets each band contributes.
+        """
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(itertools.islice(self.buckets[band].get(key, ()), per_band))
+        candidates.discard(exclude)
+        if not candidates:
+            return []
+        ids = list(candidates)
+        similarity = (np.stack([self.signatures[i] for i in ids]) == signature).mean(axis=1)
+        matches = [(float(s), i) for s, i in zip(similarity, ids) if s >= self.threshold]
+        return sorted(matches, reverse=True)
+
+    def _merge(self, target, source):
+        for ticket_id in source.members:
+            self.cluster_of[ticket_id] = target
+        target.members |= source.members
+        target.size += source.size
+        target.first_seen = min(target.first_seen, source.first_seen)
+        target.last_seen = max(target.last_seen, source.last_seen)
+        target.arrivals = deque(sorted(target.arrivals + source.arrivals))
+        target.recent = deque(sorted(target.recent + source.recent), maxlen=SAMPLE_TICKETS)
+        target.categories.update(source.categories)
+        target.priorities.update(source.priorities)
+        del self.clusters[source.id]
+
+    def _insert(self, ticket, signature, now):
+        ticket_id = ticket['id']
+        # Inside a large incident every member collides; a sample per band is enough to find its cluster
+        matches = self._candidates(signature, per_band=self.candidates_per_band)
+
+        # Join the largest matching cluster; the ticket bridges any others into it
+        clusters = {self.cluster_of[i].id: self.cluster_of[i] for _, i in matches}
+        if clusters:
+            cluster = max(clusters.values(), key=lambda c: c.size)
+            for other in clusters.values():
+                if other is not cluster:
+                    self._merge(cluster, other)
+        else:
+            cluster = self.clusters[self._next_cluster] = IncidentCluster(self._next_cluster, ticket['subject'], now)
+            self._next_cluster += 1
+
+        cluster.members.add(ticket_id)
+        cluster.size += 1
+        cluster.last_seen = now
+        cluster.arrivals.append(now)
+        cluster.recent.append((now, ticket_id))
+        cluster.categories[ticket.get('category')] += 1
+        cluster.priorities[ticket.get('priority')] += 1
+
+        self.signatures[ticket_id] = signature
+        self.subjects[ticket_id] = ticket['subject']
+        self.cluster_of[ticket_id] = cluster
+        for band, key in enumerate(self._band_keys(signature)):
+            self.buckets[band].setdefault(key, set()).add(ticket_id)
+        self._order.append((now, ticket_id))
+
+    def _evict(self, now):
+        while self._order and (self._order[0][0] < now - self.retention or len(self._order) > self.max_tickets):
+            _, ticket_id = self._order.popleft()
+            signature = self.signatures.pop(ticket_id)
+            self.subjects.pop(ticket_id)
+            for band, key in enumerate(self._band_keys(signature)):
+                bucket = self.buckets[band][key]
+                bucket.discard(ticket_id)
+                if not bucket:
+                    del self.buckets[band][key]
+            cluster = self.cluster_of.pop(ticket_id)
+            cluster.members.discard(ticket_id)
+            if not cluster.members:
+                del self.clusters[cluster.id]
+
+    def add_tickets(self, tickets, now=None):
+        """Index newly arrived tickets; ids already indexed are skipped"""
+        now = time.time() if now is None else now
+        with self._lock:
+            fresh = {}
+            for ticket in tickets:
+                if ticket['id'] not in self.signatures:
+                    fresh[ticket['id']] = ticket
+            if fresh:
+                texts = [shingles(f"{t['subject']} {t['description']}", self.shingle_size) for t in fresh.values()]
+                for ticket, signature in zip(fresh.values(), self.hasher.signatures(texts)):
+                    self._insert(ticket, signature, now)
+            self._evict(now)
+
+    def similar(self, text=None, ticket_id=None, limit=10):
+        """Indexed tickets near-identical to the given text or indexed ticket"""
+        with self._lock:
+            if ticket_id is not None:
+                signature = self.signatures.get(ticket_id)
+                if signature is None:
+                    return None
+            else:
+                signature = self.hasher.signatures([shingles(text or '', self.shingle_size)])[0]
+            return [
+                {
+                    'id': i,
+                    'similarity': round(similarity, 3),
+                    'subject': self.subjects[i],
+                    'cluster_id': self.cluster_of[i].id
+                }
+                # Bounded so a lookup inside a huge incident stays cheap; those candidates are all near-identical
+                for similarity, i in self._candidates(signature, exclude=ticket_id, per_band=max(limit * 10, 100))[:limit]
+            ]
+
+    def incidents(self, min_size=2, limit=20, now=None):
+        """Clusters of at least `min_size` tickets, fastest growing first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            incidents = [
+                cluster.to_dict(now, self.growth_window)
+                for cluster in self.clusters.values() if cluster.size >= min_size
+            ]
+        incidents.sort(key=lambda c: (c['growth_per_hour'], c['size']), reverse=True)
+        return incidents[:limit]
@@ -0,0 +1,88 @@
+import threading
+
+class LiveSnapshot:
+    """Immutable, versioned view of the live ticket buffer
+
+    Ticket dicts reachable from a snapshot are never mutated; a status change
+    publishes a new dict in a new snapshot instead.
+    """
+
+    __slots__ = ('version', 'tickets', 'versions')
+
+    def __init__(self, version=0, tickets=(), versions=()):
+        self.version = version
+        self.tickets = tickets    # tuple of ticket dicts, oldest first
+        self.versions = versions  # tuple of the version each ticket was added or last changed at
+
+    def __len__(self):
+        return len(self.tickets)
+
+    def __bool__(self):
+        return bool(self.tickets)
+
+    def last(self, n):
+        """The newest n tickets, oldest first"""
+        return self.tickets[-n:] if n else ()
+
+    def changed_since(self, version):
+        """Tickets added or changed after `version`, oldest first"""
+        return tuple(t for t, v in zip(self.tickets, self.versions) if v > version)
+
+
+class LiveBuffer:
+    """Single-writer ring buffer publishing immutable snapshots to lock-free readers"""
+
+    def __init__(self, maxlen=100):
+        self.maxlen = maxlen
+        self._snapshot = LiveSnapshot()
+        self._write_lock = threading.Lock()
+        # Writer-side index: ticket id -> absolute sequence number; position = seq - _base
+        self._seq_of = {}
+        self._base = 0
+
+    @property
+    def snapshot(self):
+        """Current snapshot; an O(1) reference read, safe from any thread"""
+        return self._snapshot
+
+    def commit(self, added=(), updates=None):
+        """Append tickets and apply {ticket_id: {field: value}} updates as one new version
+
+        Returns (snapshot, changed) where `changed` lists the new versions of updated tickets.
+        """
+        updates = updates or {}
+        with self._write_lock:
+            current = self._snapshot
+            if not added and not updates:
+                return current, []
+
+            version = current.version + 1
+            tickets = list(current.tickets)
+            versions = list(current.versions)
+            changed = []
+
+            for ticket_id, fields in updates.items():
+                seq = self._seq_of.get(ticket_id)
+                if seq is None:
+                    continue
+                i = seq - self._base
+                tickets[i] = {**tickets[i], **fields}
+                versions[i] = version
+                changed.append(tickets[i])
+
+            for ticket in added:
+                self._seq_of[ticket['id']] = self._base + len(tickets)
+                tickets.append(ticket)
+                versions.append(version)
+
+            overflow = len(tickets) - self.maxlen
+            if overflow > 0:
+                for ticket in tickets[:overflow]:
+                    if self._seq_of.get(ticket['id'], self._base + overflow) < self._base + overflow:
+                        del self._seq_of[ticket['id']]
+                del tickets[:overflow]
+                del versions[:overflow]
+                self._base += overflow
+
+            self._snapshot = LiveSnapshot(version, tuple(tickets), tuple(versions))
+            return self._snapshot, changed
@@ -0,0 +1,195 @@
+import threading
+from collections import Counter
+
+import numpy as np
+
+# Words of two or more letters; ids like Session_1234 and bare numbers never become topic terms
+TOKEN_PATTERN = r'(?u)\b[a-zA-Z][a-zA-Z]+\b'
+
+def _ticket_text(ticket):
+    return f"{ticket.get('subject', '')} {ticket.get('description', '')}"
+
+
+class StreamingTopicModel:
+    """Topics inside ticket text, learned incrementally from hashed sparse features
+
+    Text is hashed into `n_features` columns, so there is no vocabulary to
+    grow, and a MiniBatchNMF is updated one batch at a time; `forget_factor`
+    lets old batches fade so topics follow the stream. Hashing is one-way, so
+    readable names for the strongest features are recovered from sampled
+    text. Memory is bounded by `n_topics * n_features` plus one pending batch,
+    whatever the number of tickets seen.
+    """
+
+    def __init__(self, n_topics=12, n_features=2 ** 16, batch_size=512, forget_factor=0.7,
+                 ngram_range=(1, 2), name_sample=32, assign_iterations=10, warm_start_batches=20, random_state=0,
+                 preload=None):
+        self.n_topics = n_topics
+        self.n_features = n_features
+        self.batch_size = batch_size
+        self.forget_factor = forget_factor
+        self.ngram_range = ngram_range
+        self.name_sample = name_sample  # texts per batch whose terms are remembered for naming
+        self.assign_iterations = assign_iterations  # solver steps when assigning a window to topics
+        self.warm_start_batches = warm_start_batches  # most batches an unfitted model learns from one window
+        self.random_state = random_state
+        self.preload = preload  # called before the first scikit-learn import, so it can't race other importers
+        self.model = None   # built with the vectorizer on first use; scikit-learn is slow to import
+        self.fitted = False
+        self.tickets_seen = 0
+        self.terms = {}     # feature index -> a term hashed to it, at most n_features entries
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)  # texts seen containing each feature
+        self.docs_seen = 0
+        self._pending = []  # texts waiting for a full batch
+        self._lock = threading.Lock()
+
+    def _ensure_model(self):
+        if self.model is not None:
+            return
+        if self.preload is not None:
+            self.preload()
+        from sklearn.decomposition import MiniBatchNMF
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.utils import murmurhash3_32
+
+        self.vectorizer = HashingVectorizer(
+            n_features=self.n_features, alternate_sign=False, ngram_range=self.ngram_range,
+            stop_words='english', token_pattern=TOKEN_PATTERN, dtype=np.float32
+        )
+        self.analyzer = self.vectorizer.build_analyzer()
+        # The column HashingVectorizer puts a term in
+        self._feature = lambda term: abs(murmurhash3_32(term, seed=0)) % self.n_features
+        self.model = MiniBatchNMF(
+            n_components=self.n_topics, batch_size=self.batch_size, forget_factor=self.forget_factor,
+            init='nndsvda', random_state=self.random_state,
+            # Only the strongest topic per ticket is used, and it settles long before the solver converges
+            transform_max_iter=self.assign_iterations
+        )
+
+    def _remember_terms(self, texts, wanted=None):
+        """Name feature columns from the terms in `texts`, only the `wanted` ones if given"""
+        for text in texts:
+            for term in self.analyzer(text):
+                feature = self._feature(term)
+                if wanted is None:
+                    self.terms[feature] = term
+                elif feature in wanted:
+                    self.terms[feature] = term
+                    wanted.discard(feature)
+                    if not wanted:
+                        return
+
+    def _fit_batch(self, texts):
+        self._ensure_model()
+        matrix = self.vectorizer.transform(texts)
+        matrix = matrix[np.diff(matrix.indptr) > 0]  # texts without a usable term carry no signal
+        # The first update initialises the factors from the batch, which needs a row per topic
+        if matrix.shape[0] < (1 if self.fitted else self.n_topics):
+            return False
+        self.model.partial_fit(matrix)
+        self.doc_freq += np.bincount(matrix.indices, minlength=self.n_features)
+        self.docs_seen += matrix.shape[0]
+        self._remember_terms(texts[:self.name_sample])
+        self.fitted = True
+        return True
+
+    def _consume(self, texts):
+        self._pending.extend(texts)
+        while len(self._pending) >= self.batch_size:
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            self._fit_batch(batch)
+
+    def add_tickets(self, tickets):
+        """Queue tickets and update the model once a full batch has arrived"""
+        with self._lock:
+            self._consume(_ticket_text(ticket) for ticket in tickets)
+            self.tickets_seen += len(tickets)
+
+    def _top_terms(self, features, values, limit, texts=()):
+        """Term and share of weight for the heaviest named features"""
+        # Ranked by idf-weighted mass so phrasing shared by every ticket sinks
+        values = values * (np.log((1 + self.docs_seen) / (1 + self.doc_freq[features])) + 1)
+        # A few spare candidates cover features that have no name yet
+        order = np.argsort(-values)[:limit * 2]
+        unnamed = {int(f) for f in features[order] if int(f) not in self.terms}
+        if unnamed and texts:
+            self._remember_terms(texts, unnamed)
+        named = [(self.terms[int(f)], float(v)) for f, v in zip(features[order], values[order]) if int(f) in self.terms]
+        total = float(values.sum())
+        return [
+            {'term': term, 'weight': round(value / total, 4) if total else 0.0}
+            for term, value in named[:limit]
+        ]
+
+    def topic_terms(self, top_terms=8):
+        """The heaviest named terms of each topic in the model"""
+        with self._lock:
+            if not self.fitted:
+                return []
+            return [
+                self._top_terms(np.flatnonzero(row), row[row > 0], top_terms)
+                for row in self.model.components_
+            ]
+
+    def summarize(self, tickets, top_terms=8, batch_size=None):
+        """Tickets and leading terms per topic for one analysis window, largest topic first
+
+        Each ticket counts toward its strongest topic. Terms are ranked by the
+        window's own text inside the topic, so the same topic can read
+        differently from one window to the next. The window is transformed in
+        batches of sparse rows; nothing the size of the window is held densely.
+        """
+        from scipy import sparse
+
+        tickets = list(tickets)
+        batch_size = batch_size or self.batch_size
+        with self._lock:
+            if not self.fitted:
+                # Nothing has streamed in yet; learn from an even sample of the window itself
+                step = max(len(tickets) // (self.batch_size * self.warm_start_batches), 1)
+                self._consume(_ticket_text(t) for t in tickets[::step])
+                if self._pending and self._fit_batch(self._pending):
+                    self._pending = []
+            if not self.fitted:
+                return {'topics': [], 'tickets': len(tickets), 'unassigned': len(tickets)}
+
+        counts = np.zeros(self.n_topics, dtype=np.int64)
+        term_mass = sparse.csr_matrix((self.n_topics, self.n_features), dtype=np.float64)
+        categories = [Counter() for _ in range(self.n_topics)]
+        sample_texts = [[] for _ in range(self.n_topics)]
+        unassigned = 0
+        for start in range(0, len(tickets), batch_size):
+            batch = tickets[start:start + batch_size]
+            texts = [_ticket_text(t) for t in batch]
+            matrix = self.vectorizer.transform(texts)
+            # Locked per batch so streaming updates can interleave with a long window
+            with self._lock:
+                weights = self.model.transform(matrix)  # rows x n_topics, small and dense
+            labels = weights.argmax(axis=1)
+            rows = np.flatnonzero(weights.max(axis=1) > 0)
+            unassigned += len(batch) - len(rows)
+            membership = sparse.csr_matrix(
+                (np.ones(len(rows)), (labels[rows], rows)), shape=(self.n_topics, len(batch))
+            )
+            term_mass = term_mass + membership @ matrix
+            counts += np.bincount(labels[rows], minlength=self.n_topics)
+            for row in rows:
+                topic = labels[row]
+                categories[topic][batch[row].get('category')] += 1
+                if len(sample_texts[topic]) < self.name_sample:
+                    sample_texts[topic].append(texts[row])
+
+        topics = []
+        with self._lock:
+            for topic in np.argsort(-counts, kind='stable'):
+                if not counts[topic]:
+                    continue
+                row = term_mass.getrow(topic)
+                topics.append({
+                    'topic': int(topic),
+                    'tickets': int(counts[topic]),
+                    'share': round(counts[topic] / len(tickets), 4),
+                    'top_terms': self._top_terms(row.indices, row.data, top_terms, sample_texts[topic]),
+                    'categories': dict(categories[topic].most_common())
+                })
+        return {'topics': topics, 'tickets': len(tickets), 'unassigned': unassigned}
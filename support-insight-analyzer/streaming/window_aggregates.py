@@ -0,0 +1,63 @@
+from collections import Counter, deque
+
+class WindowAggregates:
+    """Running counters over the newest `window_size` tickets, updated in O(1) per ticket"""
+
+    def __init__(self, window_size):
+        self.window_size = window_size
+        self.version = None
+        self._order = deque()   # ticket ids, oldest first
+        self._tickets = {}      # ticket id -> current version of the ticket
+        self.categories = Counter()
+        self.priorities = Counter()
+        self.sentiments = Counter()
+        self.response_time_sum = 0
+        self.resolved = 0
+
+    @classmethod
+    def from_tickets(cls, tickets, window_size=None):
+        aggregates = cls(window_size or max(len(tickets), 1))
+        for ticket in tickets:
+            aggregates.add(ticket)
+        return aggregates
+
+    def __len__(self):
+        return len(self._order)
+
+    def _count(self, ticket, sign):
+        self.categories[ticket['category']] += sign
+        self.priorities[ticket['priority']] += sign
+        self.sentiments[ticket['customer_sentiment']] += sign
+        self.response_time_sum += sign * ticket.get('response_time', 0)
+        if ticket.get('status') == 'Resolved':
+            self.resolved += sign
+
+    def add(self, ticket):
+        """A ticket enters the window; the oldest one leaves if the window is full"""
+        if ticket['id'] in self._tickets:
+            self.update(ticket)
+            return
+        self._order.append(ticket['id'])
+        self._tickets[ticket['id']] = ticket
+        self._count(ticket, 1)
+
+        if len(self._order) > self.window_size:
+            expired = self._tickets.pop(self._order.popleft())
+            self._count(expired, -1)
+
+    def update(self, ticket):
+        """Apply a status/sentiment change as a delta; ignored if the ticket already left the window"""
+        previous = self._tickets.get(ticket['id'])
+        if previous is None:
+            return
+        self._count(previous, -1)
+        self._tickets[ticket['id']] = ticket
+        self._count(ticket, 1)
+
+    def apply(self, version, added=(), changed=()):
+        """Fold one buffer commit into the window"""
+        for ticket in changed:
+            self.update(ticket)
+        for ticket in added:
+            self.add(ticket)
+        self.version = version
@@ -0,0 +1,99 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from agents.analysis_agent import AnalysisAgent, TicketAggregates, create_topic_model, preload_dependencies
+from memory.sentiment_cache import SentimentCache
+
+CATEGORIES = ["Technical", "Billing", "Account", "Feature"]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+TICKETS = [
+    {'category': "Billing", 'priority': "High", 'created_date': "2026-10-02"},
+    {'category': "Billing", 'priority': "Low", 'created_date': "2026-10-01"},
+    {'category': "Billing", 'priority': "High", 'created_date': "2026-10-01"},
+    {'category': "Account", 'priority': "High", 'created_date': "2026-10-02"},
+]
+
+
+@pytest.fixture
+def agent(tmp_path):
+    return AnalysisAgent(sentiment_cache=SentimentCache(path=str(tmp_path / 'sentiment.db')))
+
+
+def week_of_tickets(per_day=12, surge_category=None, surge_days=2, surge_factor=4, seed=0):
+    """Seven days of tickets at a steady daily rate per category, optionally surging at the end"""
+    rnd = random.Random(seed)
+    end = date(2026, 10, 17)
+    tickets = []
+    for day in range(7):
+        created = (end - timedelta(days=6 - day)).isoformat()
+        for category in CATEGORIES:
+            count = per_day
+            if category == surge_category and day >= 7 - surge_days:
+                count *= surge_factor
+            tickets += [
+                {'category': category, 'priority': rnd.choice(PRIORITIES), 'created_date': created}
+                for _ in range(count)
+            ]
+    return tickets
+
+
+def test_aggregates_count_each_dimension_once():
+    aggregates = TicketAggregates(TICKETS)
+
+    assert aggregates.total == 4
+    assert list(aggregates.category_counts.items()) == [("Billing", 3), ("Account", 1)]
+    assert list(aggregates.priority_counts.items()) == [("High", 3), ("Low", 1)]
+    assert list(aggregates.daily_volume.items()) == [("2026-10-01", 2), ("2026-10-02", 2)]
+    assert aggregates.priority_by_category() == {"Billing": {"High": 2, "Low": 1}, "Account": {"High": 1}}
+
+
+def test_aggregates_bucket_timestamps_by_day():
+    tickets = [
+        dict(ticket, created_date=f"{ticket['created_date']} {hour:02d}:15:00")
+        for hour, ticket in enumerate(TICKETS)
+    ]
+
+    aggregates = TicketAggregates(tickets)
+
+    assert list(aggregates.daily_volume.items()) == [("2026-10-01", 2), ("2026-10-02", 2)]
+    assert aggregates.counts.to_dict() == TicketAggregates(TICKETS).counts.to_dict()
+
+
+def test_trend_stages_share_one_aggregation(agent):
+    tickets = list(TICKETS)
+
+    assert agent.aggregate(tickets) is agent.aggregate(tickets)
+    assert agent.detect_trends(tickets)['most_common_category'] == "Billing"
+    assert sum(agent.analyze_priorities(tickets)['priority_distribution'].values()) == len(tickets)
+
+
+def test_surge_at_end_of_week_window_is_emerging(agent):
+    issues = agent.detect_emerging_issues(TicketAggregates(week_of_tickets(surge_category="Billing")))
+
+    assert issues
+    assert {issue['category'] for issue in issues} == {"Billing"}
+    assert any(issue['priority'] is None for issue in issues)
+
+
+def test_steady_week_window_has_no_emerging_issues(agent):
+    assert agent.detect_emerging_issues(TicketAggregates(week_of_tickets())) == []
+
+
+def test_single_day_window_has_no_emerging_issues(agent):
+    tickets = [t for t in week_of_tickets(surge_category="Billing") if t['created_date'] == "2026-10-17"]
+
+    assert agent.detect_emerging_issues(TicketAggregates(tickets)) == []
+
+
+def test_topic_model_loads_dependencies_through_the_shared_preload():
+    model = create_topic_model()
+    assert model.preload is preload_dependencies
+
+    calls = []
+    model.preload = lambda: calls.append(model.model)
+    model.batch_size = 2
+    model.add_tickets([{'subject': "Login fails", 'description': "password reset loop"}] * 2)
+    assert calls == [None]
+    assert model.model is not None
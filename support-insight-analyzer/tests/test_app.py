@@ -0,0 +1,132 @@
+import json
+import os
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from memory.memory_manager import MemoryManager
+
+
+@pytest.fixture(scope='module')
+def workdir(tmp_path_factory):
+    """The app keeps its databases under relative paths, so it runs from a scratch directory"""
+    path = tmp_path_factory.mktemp('app')
+    os.makedirs(path / 'memory')
+    previous = os.getcwd()
+    os.chdir(path)
+    yield path
+    os.chdir(previous)
+
+
+@pytest.fixture(scope='module')
+def app_module(workdir):
+    import app as app_module
+    app_module.create_app(start_background=False, prewarm=False)
+    yield app_module
+    # Written now, while the relative search folder still points at the scratch directory
+    app_module.memory_manager.save_search_index()
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.create_app(start_background=False, prewarm=False).test_client()
+
+
+def wait_for_job(client, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/api/analysis/{job_id}").get_json()
+        if job['status'] in ('completed', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"{job_id} did not finish")
+
+
+def test_producer_batches_reach_the_live_views(app_module, client):
+    for _ in range(5):
+        trends = app_module.produce_live_batch()
+
+    assert trends
+    live = client.get('/api/live-data').get_json()
+    assert live['recent_tickets']
+    assert app_module.system_metrics['tickets_processed'] >= 5
+    for page in ('/', '/real-time-analysis', '/historical-trends'):
+        assert client.get(page).status_code == 200
+
+
+def test_ingest_answers_429_while_the_writer_is_behind(app_module, client, monkeypatch):
+    from app_config import Config
+    from ingest.batch_ingestor import BatchIngestor
+
+    # Never started, so queued batches stay queued
+    ingestor = BatchIngestor(lambda batch: None, max_queued_batches=Config.INGEST_MAX_QUEUED_BATCHES)
+    monkeypatch.setattr(app_module, 'ingestor', ingestor)
+    record = {'subject': "Login failure", 'description': "cannot sign in", 'priority': "High",
+              'category': "Account", 'created_date': "2026-10-17 09:00:00"}
+    while not ingestor._queue.full():
+        ingestor._queue.put_nowait([record])
+
+    response = client.post('/api/tickets/batch', data=json.dumps(record) + '\n')
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == str(Config.INGEST_RETRY_AFTER)
+    assert response.get_json()['resume_from_line'] == 1
+
+
+def test_ingested_tickets_are_stored_and_counted(app_module, client):
+    before = app_module.system_metrics['tickets_processed']
+    lines = [
+        json.dumps({'id': f"ING-{i}", 'subject': "Printer jam", 'description': "tray 2", 'priority': "Low",
+                    'category': "Technical", 'created_date': "2026-10-17 09:00:00"})
+        for i in range(3)
+    ] + ['not json']
+
+    body = client.post('/api/tickets/batch', data='\n'.join(lines)).get_json()
+    app_module.ingestor._queue.join()
+
+    assert (body['accepted'], body['rejected']) == (3, 1)
+    assert app_module.system_metrics['tickets_processed'] == before + 3
+    assert len(app_module.memory_manager.storage.get_tickets([f"ING-{i}" for i in range(3)])) == 3
+
+
+def test_window_analysis_job_completes_with_unique_ids(app_module, client):
+    app_module.produce_live_batch()
+    ids = []
+    for _ in range(2):
+        response = client.post('/api/run-analysis')
+        assert response.status_code == 202
+        job = wait_for_job(client, response.get_json()['job_id'])
+        assert job['status'] == 'completed', job['error']
+        ids.append(job['result']['analysis_id'])
+        app_module.produce_live_batch()  # a new window, so the second request is a new job
+
+    assert len(set(ids)) == 2
+
+
+def test_weekly_pipeline_reports_a_surge_in_its_last_days(workdir, tmp_path):
+    from agents.orchestrator import Orchestrator
+
+    manager = MemoryManager(db_path=str(tmp_path / 'support.db'), seed_sample_data=False)
+    today = date.today()
+    tickets = []
+    for days_ago in range(7):
+        for category in ("Billing", "Account", "Technical"):
+            count = 40 if category == "Billing" and days_ago < 2 else 10
+            tickets += [{
+                'id': f"{category}-{days_ago}-{n}", 'subject': f"{category} issue", 'description': "details",
+                'priority': "Medium", 'category': category, 'status': "Open", 'customer_sentiment': "Neutral",
+                'created_date': (today - timedelta(days=days_ago)).isoformat()
+            } for n in range(count)]
+    manager.add_tickets(tickets)
+
+    result = Orchestrator(manager).run_complete_analysis()
+
+    assert result['status'] == 'completed', result['stage_status']
+    assert {issue['category'] for issue in result['trend_analysis']['emerging_issues']} == {"Billing"}
+
+
+def test_search_endpoint_validates_cursor(client):
+    assert client.get('/api/search?q=login').status_code == 200
+    assert client.get('/api/search?q=login&cursor=-1').status_code == 400
+    assert client.get('/api/search').status_code == 400
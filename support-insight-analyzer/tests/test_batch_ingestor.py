@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from ingest.batch_ingestor import BatchIngestor, IngestBackpressure, TicketValidationError, normalize_ticket
+
+
+def record(**fields):
+    return dict({
+        'subject': "Login failure", 'description': "cannot sign in", 'priority': "High",
+        'category': "Account", 'created_date': "2026-10-17T09:30:00Z"
+    }, **fields)
+
+
+def test_full_queue_raises_backpressure_until_the_writer_catches_up():
+    release = threading.Event()
+    written = []
+
+    def sink(batch):
+        release.wait(5)
+        written.append(batch)
+
+    ingestor = BatchIngestor(sink, max_queued_batches=2)
+    ingestor.submit(['a'])  # taken by the writer, which then blocks in the sink
+    for _ in range(100):
+        if ingestor.pending_batches == 0:
+            break
+        threading.Event().wait(0.01)
+    ingestor.submit(['b'])
+    ingestor.submit(['c'])
+
+    with pytest.raises(IngestBackpressure):
+        ingestor.submit(['d'])
+
+    release.set()
+    ingestor._queue.join()
+    assert written == [['a'], ['b'], ['c']]
+    assert ingestor.tickets_written == 3
+
+
+def test_idle_writer_runs_idle_task():
+    idle = threading.Event()
+    ingestor = BatchIngestor(lambda batch: None, on_idle=idle.set, idle_interval=0.01)
+    ingestor.start()
+
+    assert idle.wait(2)
+
+
+def test_normalize_fills_defaults_and_derived_fields():
+    ticket = normalize_ticket(record(id=42))
+
+    assert ticket['id'] == '42'
+    assert ticket['status'] == 'Open'
+    assert ticket['customer_sentiment'] == 'Neutral'
+    assert ticket['created_date'] == '2026-10-17 09:30:00'
+    assert ticket['urgency_level'] == 3
+
+
+@pytest.mark.parametrize('bad', [
+    record(priority="Urgent"), record(subject=""), record(created_date="yesterday"), record(response_time="soon")
+])
+def test_normalize_rejects_invalid_records(bad):
+    with pytest.raises(TicketValidationError):
+        normalize_ticket(bad)
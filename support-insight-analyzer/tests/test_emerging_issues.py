@@ -0,0 +1,60 @@
+from streaming.emerging_issues import EmergingIssueDetector
+
+START = 1_700_000_000
+
+
+def steady(detector, minutes, start=START, category="Billing"):
+    """One ticket a minute; returns the events raised"""
+    events = []
+    for minute in range(minutes):
+        events += detector.observe(category, "Medium", now=start + minute * 60)
+    return events
+
+
+def test_steady_rate_raises_nothing():
+    detector = EmergingIssueDetector()
+
+    assert steady(detector, 6 * 60) == []
+    assert detector.emerging(now=START + 6 * 3600) == []
+
+
+def test_surge_is_flagged_with_its_onset_then_clears():
+    detector = EmergingIssueDetector()
+    steady(detector, 4 * 60)
+    surge_start = START + 4 * 3600
+
+    events = []
+    for second in range(0, 20 * 60, 6):  # ten a minute
+        events += detector.observe("Billing", "High", now=surge_start + second)
+
+    assert {event['segment'] for event in events} == {"Billing", "Billing / High"}
+    category_event = next(event for event in events if event['priority'] is None)
+    assert category_event['onset'] <= category_event['detected_at']
+    emerging = detector.emerging(now=surge_start + 20 * 60)
+    assert emerging[0]['z_score'] >= 3
+    assert emerging[0]['rate_per_hour'] > emerging[0]['baseline_per_hour']
+    assert [event['segment'] for event in detector.recent_events()] == [event['segment'] for event in events]
+
+    # Back to normal: the CUSUM drains and the segments stop emerging
+    steady(detector, 4 * 60, start=surge_start + 20 * 60)
+    assert detector.emerging(now=surge_start + 20 * 60 + 4 * 3600) == []
+
+
+def test_nothing_is_flagged_during_warmup():
+    detector = EmergingIssueDetector(warmup=3600)
+
+    events = []
+    for second in range(0, 20 * 60, 6):
+        events += detector.observe("Billing", "High", now=START + second)
+
+    assert events == []
+
+
+def test_surge_in_one_category_leaves_others_quiet():
+    detector = EmergingIssueDetector()
+    steady(detector, 4 * 60, category="Account")
+    steady(detector, 4 * 60, category="Billing")
+
+    detector.add_tickets([{'category': "Billing", 'priority': "High"}] * 60, now=START + 4 * 3600)
+
+    assert {issue['category'] for issue in detector.emerging(now=START + 4 * 3600)} == {"Billing"}
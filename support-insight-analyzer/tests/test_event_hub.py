@@ -0,0 +1,48 @@
+import itertools
+
+from streaming.event_hub import EventHub
+
+
+def frames(stream, count):
+    return list(itertools.islice(stream, count))
+
+
+def test_resume_replays_only_missed_events():
+    hub = EventHub(heartbeat_interval=0.01)
+    for n in range(5):
+        hub.publish('tickets', {'n': n})
+
+    replayed = frames(hub.subscribe(last_event_id=3, snapshot=lambda: {'full': True}), 2)
+
+    assert replayed == [hub.encode('tickets', {'n': 3}, 4), hub.encode('tickets', {'n': 4}, 5)]
+
+
+def test_new_subscriber_starts_from_a_snapshot_then_follows_live_events():
+    hub = EventHub(heartbeat_interval=0.01)
+    hub.publish('tickets', {'n': 0})
+    stream = hub.subscribe(snapshot=lambda: {'full': True})
+
+    assert next(stream) == hub.encode('snapshot', {'full': True}, 1)
+    assert hub.subscribers == 1
+    hub.publish('tickets', {'n': 1})
+    assert next(stream) == hub.encode('tickets', {'n': 1}, 2)
+
+    stream.close()
+    assert hub.subscribers == 0
+
+
+def test_resume_point_outside_backlog_falls_back_to_snapshot():
+    hub = EventHub(backlog_size=3, heartbeat_interval=0.01)
+    for n in range(10):
+        hub.publish('tickets', {'n': n})
+
+    # Too old for the backlog, and one from before a restart
+    for last_event_id in (2, 50):
+        first = next(hub.subscribe(last_event_id=last_event_id, snapshot=lambda: {'full': True}))
+        assert first == hub.encode('snapshot', {'full': True}, 10)
+
+
+def test_idle_stream_sends_heartbeats():
+    hub = EventHub(heartbeat_interval=0.01)
+
+    assert next(hub.subscribe(last_event_id=0)) == ": heartbeat\n\n"
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from ingest import import_tickets
+from memory.memory_manager import MemoryManager
+
+
+def write_export(path, rows, bad_rows=()):
+    lines = [
+        json.dumps({'Ticket ID': f"EXP-{i}", 'Title': f"Login failure {i}", 'Body': "cannot sign in",
+                    'Severity': "High", 'Type': "Account", 'created_date': "2026-10-01 09:00:00"})
+        for i in range(rows)
+    ]
+    for index in bad_rows:
+        lines[index] = '{"Title": "no body"'
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def run(tmp_path, source, *extra):
+    return import_tickets.main([str(source), '--db', str(tmp_path / 'support.db'), '--chunk-size', '100', *extra])
+
+
+def stored_count(tmp_path):
+    return MemoryManager(db_path=str(tmp_path / 'support.db'), seed_sample_data=False).get_ticket_statistics()[
+        'total_tickets']
+
+
+def test_import_maps_columns_and_reports_rejected_rows(tmp_path, capsys):
+    source = tmp_path / 'export.ndjson'
+    write_export(source, 250, bad_rows=(10, 20))
+
+    run(tmp_path, source)
+    summary = json.loads(capsys.readouterr().out)
+
+    assert (summary['rows'], summary['imported'], summary['rejected']) == (250, 248, 2)
+    manager = MemoryManager(db_path=str(tmp_path / 'support.db'), seed_sample_data=False)
+    stored = {t['id']: t for t in manager.storage.get_tickets_since("2026-10-01")}
+    assert stored["EXP-0"]['subject'] == "Login failure 0"
+    assert manager.get_ticket_statistics()['category_distribution'] == {"Account": 248}
+
+
+def test_interrupted_import_resumes_from_checkpoint(tmp_path, monkeypatch, capsys):
+    source = tmp_path / 'export.ndjson'
+    write_export(source, 250)
+    original = MemoryManager.add_tickets
+    chunks = []
+
+    def crash_on_second_chunk(self, tickets):
+        chunks.append(len(tickets))
+        if len(chunks) == 2:
+            raise KeyboardInterrupt
+        return original(self, tickets)
+
+    monkeypatch.setattr(MemoryManager, 'add_tickets', crash_on_second_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, source)
+    assert stored_count(tmp_path) == 100
+
+    monkeypatch.setattr(MemoryManager, 'add_tickets', original)
+    run(tmp_path, source)
+    summary = json.loads(capsys.readouterr().out)
+
+    assert (summary['rows'], summary['imported']) == (250, 250)
+    assert stored_count(tmp_path) == 250
+
+    # A finished import is a no-op when rerun
+    run(tmp_path, source)
+    assert json.loads(capsys.readouterr().out)['rows'] == 250
+
+
+def test_checkpoint_for_a_changed_file_is_ignored(tmp_path, capsys):
+    source = tmp_path / 'export.ndjson'
+    write_export(source, 50)
+    run(tmp_path, source)
+    capsys.readouterr()
+
+    write_export(source, 80)
+    run(tmp_path, source)
+
+    assert json.loads(capsys.readouterr().out)['rows'] == 80
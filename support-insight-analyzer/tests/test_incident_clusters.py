@@ -0,0 +1,34 @@
+from streaming.incident_clusters import IncidentIndex
+
+
+def outage(prefix, count):
+    return [
+        {'id': f"{prefix}{i}", 'subject': "Payment gateway timeout",
+         'description': "checkout fails with a gateway timeout on the payment page"}
+        for i in range(count)
+    ]
+
+
+def test_near_duplicates_form_one_incident_listing_its_newest_tickets():
+    index = IncidentIndex()
+    index.add_tickets(outage('B', 8), now=1000)
+    index.add_tickets(outage('A', 3), now=1060)
+    index.add_tickets([{'id': 'X1', 'subject': "Refund request", 'description': "please refund my last invoice"}],
+                      now=1060)
+
+    incidents = index.incidents(now=1100)
+
+    assert len(incidents) == 1
+    assert incidents[0]['size'] == 11
+    # Newest arrivals, not the largest ids
+    assert incidents[0]['sample_ticket_ids'] == ['B6', 'B7', 'A0', 'A1', 'A2']
+    assert [match['id'] for match in index.similar(ticket_id='X1')] == []
+    duplicate = outage('Q', 1)[0]
+    assert len(index.similar(text=f"{duplicate['subject']} {duplicate['description']}")) == 10
+
+
+def test_evicted_tickets_leave_the_sample():
+    index = IncidentIndex(max_tickets=4)
+    index.add_tickets(outage('A', 6), now=1000)
+
+    assert index.incidents(now=1000)[0]['sample_ticket_ids'] == ['A2', 'A3', 'A4', 'A5']
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from jobs.job_manager import Job, JobManager, JobQueueFull
+
+
+def wait_for(job, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if job.finished:
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"{job.id} still {job.status}")
+
+
+def test_same_key_shares_one_job():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+    calls = []
+
+    def work(report_progress):
+        calls.append(1)
+        release.wait(5)
+        return 'done'
+
+    first = manager.submit(work, key='window-a')
+    second = manager.submit(work, key='window-a')
+    release.set()
+
+    assert second is first
+    assert wait_for(first).result == 'done'
+    assert first.progress == 100
+    assert calls == [1]
+
+
+def test_failed_job_is_retried_under_its_key():
+    manager = JobManager(max_workers=1)
+    failed = wait_for(manager.submit(lambda report_progress: 1 / 0, key='k'))
+
+    retried = manager.submit(lambda report_progress: 'ok', key='k')
+
+    assert failed.status == 'failed' and 'division by zero' in failed.error
+    assert retried is not failed
+    assert wait_for(retried).result == 'ok'
+
+
+def test_finished_jobs_expire_after_ttl():
+    manager = JobManager(max_workers=1, result_ttl=0.05)
+    job = wait_for(manager.submit(lambda report_progress: 'ok', key='k'))
+    assert manager.get(job.id) is job
+
+    threading.Event().wait(0.1)
+
+    assert manager.get(job.id) is None
+    assert manager.latest_completed() is None
+    assert manager.submit(lambda report_progress: 'again', key='k') is not job
+
+
+def test_job_marked_done_before_its_finish_time_is_not_evicted():
+    manager = JobManager(max_workers=1, result_ttl=0)
+    done = wait_for(manager.submit(lambda report_progress: 'ok'))
+    assert done.finished_at is not None
+
+    # A job seen between its status and finished_at being written by another worker
+    racing = Job()
+    racing.status = 'completed'
+    manager._jobs[racing.id] = racing
+
+    assert manager.get(racing.id) is racing
+    assert manager.latest_completed() is None
+
+
+def test_too_many_pending_jobs_are_refused():
+    manager = JobManager(max_workers=1, max_pending=2)
+    release = threading.Event()
+    for _ in range(2):
+        manager.submit(lambda report_progress: release.wait(5))
+
+    with pytest.raises(JobQueueFull):
+        manager.submit(lambda report_progress: None)
+    release.set()
@@ -0,0 +1,88 @@
+import pytest
+
+from memory.memory_manager import MemoryManager
+from search.inverted_index import SearchIndex, day_number
+
+
+def ticket(ticket_id, subject, description="", **fields):
+    return dict({
+        'id': ticket_id, 'subject': subject, 'description': description, 'created_date': "2026-10-01",
+        'priority': "Medium", 'category': "Technical", 'status': "Open", 'customer_sentiment': "Neutral",
+        'agent_assigned': "Agent_1"
+    }, **fields)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SearchIndex(str(tmp_path / 'index'), flush_docs=4)
+
+
+def test_bm25_ranks_rarer_and_denser_matches_first(index):
+    index.add_tickets([
+        ticket("common", "Payment question", "payment page"),
+        ticket("both", "Payment gateway timeout", "gateway times out on payment"),
+        ticket("rare", "Gateway outage", "gateway gateway down"),
+        ticket("other", "Password reset", "reset link expired"),
+    ])
+
+    total, hits = index.search("payment gateway")
+
+    assert total == 3
+    assert [ticket_id for ticket_id, _ in hits] == ["both", "rare", "common"]
+    assert hits[0][1] > hits[1][1] > hits[2][1] > 0
+
+
+def test_ranking_survives_flush_merge_and_replacement(index):
+    # flush_docs=4, so these end up in merged on-disk segments plus an in-memory delta
+    index.add_tickets([ticket(f"T{i}", "Printer jam" if i % 3 else "Login failure", "") for i in range(10)])
+    index.add_tickets([ticket("T0", "Printer jam", "")])  # T0 no longer mentions login
+
+    total, hits = index.search("login")
+    assert total == 3
+    assert {ticket_id for ticket_id, _ in hits} == {"T3", "T6", "T9"}
+    assert len(index.segments) >= 1
+
+
+def test_filters(index):
+    index.add_tickets([
+        ticket(f"T{i}", "Login failure", "", priority=["High", "Low"][i % 2],
+               created_date=f"2026-10-{i + 1:02d}")
+        for i in range(8)
+    ])
+
+    total, hits = index.search("login", {'priority': ["High"], 'start': day_number("2026-10-03")})
+    assert total == 3
+    assert {ticket_id for ticket_id, _ in hits} == {"T2", "T4", "T6"}
+    assert index.search("login", {'category': ["Billing"]}) == (0, [])
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return MemoryManager(db_path=str(tmp_path / 'support.db'), seed_sample_data=False)
+
+
+@pytest.mark.parametrize('cursor', ['abc', '-5', '1.5'])
+def test_malformed_cursor_is_rejected(manager, cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        manager.search_tickets("login", cursor=cursor)
+
+
+def test_small_index_is_saved_and_reloaded_without_reindexing(manager, tmp_path):
+    manager.add_tickets([ticket(f"T{i}", "Login failure", "cannot sign in") for i in range(10)])
+    assert manager.search_tickets("login")['total'] == 10
+
+    manager.save_search_index()
+
+    reopened = MemoryManager(db_path=str(tmp_path / 'support.db'), seed_sample_data=False)
+    index = reopened.search_index
+    assert index.sync(reopened.storage) == 0
+    assert index.search("login")[0] == 10
+
+
+def test_pages_agree_on_order_when_scores_tie(index):
+    index.add_tickets([ticket(f"T{i}", "Login failure", "") for i in range(8)])
+
+    pages = [index.search("login", offset=offset, limit=3)[1] for offset in (0, 3, 6)]
+
+    # Identical tickets score the same; the newest comes first on every page
+    assert [ticket_id for page in pages for ticket_id, _ in page] == [f"T{i}" for i in range(7, -1, -1)]
@@ -0,0 +1,69 @@
+import json
+
+from memory.memory_manager import MemoryManager
+from memory.storage import AnalysisQuery, SQLiteStorage
+
+
+def legacy_data():
+    return {
+        'tickets': [
+            {'id': f"TKT-{i}", 'created_date': f"2026-10-{i + 1:02d}", 'priority': ["High", "Low"][i % 2],
+             'category': "Billing", 'status': ["Open", "Resolved"][i % 2], 'customer_sentiment': "Neutral",
+             'subject': "Invoice question", 'description': "charged twice"}
+            for i in range(6)
+        ],
+        'analyses': [
+            {'id': "ANA-1", 'timestamp': "2026-10-01T09:00:00", 'insights': []},
+            {'id': "ANA-2", 'timestamp': "2026-10-02T09:00:00", 'insights': []}
+        ],
+        'system_status': {'last_analysis': "ANA-2"}
+    }
+
+
+def test_empty_database_migrates_legacy_json(tmp_path):
+    legacy = tmp_path / 'support_data.json'
+    legacy.write_text(json.dumps(legacy_data()))
+
+    manager = MemoryManager(db_path=str(tmp_path / 'support.db'), legacy_json_path=str(legacy))
+
+    stats = manager.get_ticket_statistics()
+    assert stats['total_tickets'] == 6
+    assert stats['open_tickets'] == 3
+    assert stats['priority_distribution'] == {"High": 3, "Low": 3}
+    assert [a['id'] for a in manager.get_historical_analyses()] == ["ANA-1", "ANA-2"]
+    assert manager.storage.get_meta('system_status') == {'last_analysis': "ANA-2"}
+
+
+def test_migration_runs_only_into_an_empty_database(tmp_path):
+    legacy = tmp_path / 'support_data.json'
+    legacy.write_text(json.dumps(legacy_data()))
+    MemoryManager(db_path=str(tmp_path / 'support.db'), legacy_json_path=str(legacy))
+
+    data = legacy_data()
+    data['tickets'] = data['tickets'][:1]
+    legacy.write_text(json.dumps(data))
+    manager = MemoryManager(db_path=str(tmp_path / 'support.db'), legacy_json_path=str(legacy))
+
+    assert manager.get_ticket_statistics()['total_tickets'] == 6
+
+
+def test_analyses_page_through_keyset_cursor(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / 'support.db'))
+    for day in range(1, 6):
+        storage.append_analysis({'timestamp': f"2026-10-0{day}T09:00:00"})
+
+    first = list(storage.iter_analyses(AnalysisQuery(limit=2)))
+    rest = list(storage.iter_analyses(AnalysisQuery(after=first[-1][0])))
+
+    assert [a['id'] for _, a in first + rest] == [f"ANA-{i}" for i in range(1, 6)]
+
+
+def test_replaced_ticket_is_returned_again_after_its_old_position(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / 'support.db'))
+    storage.insert_tickets(legacy_data()['tickets'])
+    position = max(rowid for rowid, _ in storage.iter_tickets_after(0, 100))
+
+    storage.insert_tickets([dict(legacy_data()['tickets'][0], status="Resolved")])
+
+    assert [(t['id'], t['status']) for _, t in storage.iter_tickets_after(position, 100)] == [("TKT-0", "Resolved")]
+